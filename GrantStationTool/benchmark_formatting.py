@@ -0,0 +1,55 @@
+# benchmark_formatting.py
+#
+# Times formatting opportunities for the results window's detail pane, the
+# first time each is shown and when it is shown again (e.g. after a re-filter).
+# Run with: python benchmark_formatting.py [max_count]
+
+import sys
+import time
+from opportunity import Opportunity
+from formatting import format_opportunity, render_fields
+
+SIZES = (1000, 2000, 5000, 10000)
+
+def make_opportunities(count):
+    """Synthetic opportunities roughly the size of real detail pages"""
+    opportunities = []
+    for i in range(count):
+        opportunities.append(Opportunity.from_dict({
+            'title': f"Community Health Research Grant {i}",
+            'agency': f"Agency {i % 40}",
+            'opportunity_number': f"HHS-2026-{i:05d}",
+            'post_date': "01/15/2026",
+            'close_date': "06/30/2026",
+            'description': " ".join(f"word{j}" for j in range(150)) + f" grant {i}",
+            'eligible_applicants': ["Nonprofits", "State governments", "Tribal organizations"],
+            'cfda_numbers': [f"93.{i % 1000:03d}"],
+            'grants_gov_url': f"https://www.grants.gov/view-opportunity/{i}",
+            'is_new': i % 7 == 0,
+            'matched_keywords': ["health"]
+        }, f"https://grantstation.com/opportunity/{i}"))
+    return opportunities
+
+def timed(function, opportunities):
+    start = time.perf_counter()
+    for opp in opportunities:
+        function(opp)
+    return time.perf_counter() - start
+
+def main():
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    sizes = [size for size in SIZES if size <= max_count] or [max_count]
+    print(f"{'count':>8} {'first (s)':>10} {'us/opp':>8} {'again (s)':>10} {'us/opp':>8}")
+    for count in sizes:
+        opportunities = make_opportunities(count)
+        render_fields.cache_clear()
+        first = timed(format_opportunity, opportunities)
+        # Selecting the same opportunities again is served from the format cache
+        again = timed(format_opportunity, opportunities)
+        print(f"{count:>8} {first:>10.3f} {first / count * 1e6:>8.1f} "
+              f"{again:>10.3f} {again / count * 1e6:>8.1f}")
+    info = render_fields.cache_info()
+    print(f"Format cache: {info.hits} hits, {info.misses} misses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# cli.py
+
+"""Headless command-line search, streaming matching opportunities as JSONL, CSV or Parquet.
+
+Example:
+    python cli.py "rural health" "water" --filter "High Value Opportunities" --output results.jsonl
+
+Progress messages go to stderr, so the JSONL output can be piped into other tools.
+"""
+
+import argparse
+import os
+import sys
+from contextlib import redirect_stdout
+from scraper import GrantStationScraper
+from filter_manager import FilterManager
+from query_planner import plan_batch_urls, load_keywords
+from exporters import EXPORTERS, open_exporter
+from config import USERNAME, PASSWORD, DEFAULT_WORKERS
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search GrantStation without the GUI and export the results")
+    parser.add_argument("keywords", nargs="*", help="search keywords, each searched separately")
+    parser.add_argument("--keywords-file", help="file with one keyword per line")
+    parser.add_argument("--filter", dest="filter_name", help="name of a saved filter to apply")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="detail pages fetched in parallel")
+    parser.add_argument("--engine", choices=GrantStationScraper.ENGINES, default="http",
+                        help="http uses Chrome only to log in (default), selenium drives Chrome throughout")
+    parser.add_argument("--output", "-o", help="file to write (default: stdout)")
+    parser.add_argument("--format", choices=tuple(EXPORTERS),
+                        help="output format (default: from the output file extension, else jsonl)")
+    parser.add_argument("--max-pages", type=int, help="listing pages to crawl per search")
+    parser.add_argument("--max-results", type=int, help="stop after this many listings")
+    parser.add_argument("--force-refresh", action="store_true", help="ignore cached opportunity details")
+    parser.add_argument("--incremental", action="store_true", help="only fetch opportunities new since the last run")
+    parser.add_argument("--refetch-changed", action="store_true",
+                        help="with --incremental, also refetch opportunities whose listing changed")
+    # Only the filtered results are exported, so skipping listings the filter
+    # rules out loses nothing here and stays on unless asked otherwise
+    parser.add_argument("--no-pushdown", action="store_true",
+                        help="fetch every detail page, even ones the filter rules out from the listing")
+    parser.add_argument("--offline", action="store_true",
+                        help="search only opportunities fetched before, without logging in")
+    parser.add_argument("--debug", action="store_true", help="print debug information to stderr")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    keywords = list(args.keywords)
+    if args.keywords_file:
+        try:
+            keywords.extend(load_keywords(args.keywords_file))
+        except Exception as e:
+            print(f"Error loading keywords: {str(e)}", file=sys.stderr)
+            return 2
+
+    search_filter = None
+    if args.filter_name:
+        search_filter = FilterManager().filters.get(args.filter_name)
+        if search_filter is None:
+            print(f"No saved filter named '{args.filter_name}'", file=sys.stderr)
+            return 2
+
+    # Offline, any filter can be answered from the local index on its own
+    if not keywords and not (search_filter and (args.offline or search_filter.keywords or
+                                                search_filter.cfda_numbers or
+                                                search_filter.opportunity_number)):
+        print("Give at least one keyword, a keywords file or a filter with keywords", file=sys.stderr)
+        return 2
+
+    urls = plan_batch_urls(keywords, search_filter)
+    try:
+        exporter = open_exporter(args.output, args.format)
+    except Exception as e:
+        print(f"Error opening output: {str(e)}", file=sys.stderr)
+        return 2
+
+    scraper = GrantStationScraper(
+        os.environ.get("GRANTSTATION_USERNAME", USERNAME),
+        os.environ.get("GRANTSTATION_PASSWORD", PASSWORD)
+    )
+    try:
+        # The scraper reports progress with print(); keep it out of the JSONL stream
+        with redirect_stdout(sys.stderr):
+            results = scraper.search(
+                urls,
+                debug_mode=args.debug,
+                search_filter=search_filter,
+                engine=args.engine,
+                max_workers=max(1, args.workers),
+                max_pages=args.max_pages,
+                max_results=args.max_results,
+                force_refresh=args.force_refresh,
+                incremental=args.incremental,
+                refetch_changed=args.refetch_changed,
+                pushdown=not args.no_pushdown,
+                on_result=exporter.write,
+                collect=False,
+                offline=args.offline
+            )
+            if args.debug:
+                print(results['debug_text'])
+        print(f"Wrote {exporter.count} opportunities", file=sys.stderr)
+        return 0
+    except Exception as e:
+        print(f"Search failed: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        scraper.close()
+        exporter.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
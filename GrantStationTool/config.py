@@ -8,4 +8,59 @@ PASSWORD = 'dsala2024####'
 BASE_URL = "https://grantstation.com"
 
 # Search URL template
-SEARCH_URL_TEMPLATE = BASE_URL + "/search/us-federal?keyword={}&opp_number=&cfda="
\ No newline at end of file
+SEARCH_URL_TEMPLATE = BASE_URL + "/search/us-federal?keyword={keyword}&opp_number={opp_number}&cfda={cfda}"
+
+# Most search URLs one search is split into (see query_planner)
+MAX_PLANNED_QUERIES = 10
+
+# Browser user agent shared by Chrome and the HTTP engine
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Saved session cookies
+COOKIES_FILE = 'grantstation_cookies.json'
+
+# HTTP engine settings
+HTTP_POOL_SIZE = 10
+HTTP_TIMEOUT = 30
+
+# Number of detail pages fetched in parallel
+DEFAULT_WORKERS = 4
+
+# Pages a pooled Chrome instance loads before it is replaced
+DRIVER_MAX_PAGES = 50
+
+# Longest time (seconds) to wait for each kind of page to become ready
+WAIT_TIMEOUTS = {
+    'homepage': 10,
+    'cookie_refresh': 10,
+    'listing': 20,
+    'detail': 15,
+    'default': 20
+}
+
+# Limits for how far a search listing is crawled (None for no limit)
+MAX_LISTING_PAGES = 50
+MAX_RESULTS = None
+
+# Local cache of extracted opportunity details
+CACHE_FILE = 'grantstation_cache.sqlite'
+CACHE_TTL_HOURS = 24
+CACHE_MAX_ENTRIES = 20000
+
+# Number of best-scoring results shown in the Top Matches tab
+TOP_K_RESULTS = 50
+
+# Exported results are flushed to disk every this many opportunities
+EXPORT_FLUSH_EVERY = 50
+
+# Rows per Parquet row group; Parquet compresses and reads well only in large groups
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# Format used by the results window's Save Results button (jsonl, csv or parquet)
+SAVE_RESULTS_FORMAT = 'csv'
+
+# How often (milliseconds) the search window checks for progress from the search thread
+PROGRESS_POLL_MS = 100
+
+# Formatted opportunities kept in memory, so one shown in several places is formatted once
+FORMAT_CACHE_SIZE = 20000
@@ -0,0 +1,119 @@
+# driver_pool.py
+
+import queue
+import threading
+from contextlib import contextmanager
+from config import DRIVER_MAX_PAGES
+
+class DriverPool:
+    """Keeps logged-in WebDriver instances warm between searches.
+
+    Drivers are created on demand by the factory up to `size`, checked for health
+    when handed out, and recycled once they have loaded `max_pages` pages.
+    """
+
+    def __init__(self, factory, size=1, max_pages=DRIVER_MAX_PAGES):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.idle = queue.LifoQueue()
+        self.page_counts = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def resize(self, size):
+        with self.lock:
+            self.size = max(1, size)
+
+    def acquire(self):
+        """Hand out a healthy driver, starting a new one if the pool has room"""
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                driver = self._create_if_room()
+                if driver is None:
+                    # Poll so a slot freed by recycling is noticed
+                    try:
+                        driver = self.idle.get(timeout=1)
+                    except queue.Empty:
+                        continue
+
+            if self.is_healthy(driver):
+                return driver
+
+            print("Discarding unresponsive Chrome driver")
+            self.discard(driver)
+
+    def _create_if_room(self):
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Driver pool is closed")
+            if len(self.page_counts) >= self.size:
+                return None
+            # Reserve the slot before the slow Chrome startup
+            placeholder = object()
+            self.page_counts[placeholder] = 0
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self.lock:
+                del self.page_counts[placeholder]
+            raise
+
+        with self.lock:
+            del self.page_counts[placeholder]
+            self.page_counts[driver] = 0
+        return driver
+
+    def record_page(self, driver):
+        with self.lock:
+            if driver in self.page_counts:
+                self.page_counts[driver] += 1
+
+    def release(self, driver):
+        """Return a driver to the pool, recycling it if it has served enough pages"""
+        with self.lock:
+            pages = self.page_counts.get(driver, 0)
+            over_size = len(self.page_counts) > self.size
+            closed = self.closed
+
+        if closed or over_size or pages >= self.max_pages:
+            if pages >= self.max_pages:
+                print(f"Recycling Chrome driver after {pages} pages")
+            self.discard(driver)
+        else:
+            self.idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def is_healthy(self, driver):
+        try:
+            return driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def discard(self, driver):
+        with self.lock:
+            self.page_counts.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing Chrome driver: {str(e)}")
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
@@ -0,0 +1,150 @@
+# exporters.py
+
+import csv
+import json
+import os
+import sys
+from opportunity import Opportunity
+from config import EXPORT_FLUSH_EVERY, PARQUET_ROW_GROUP_SIZE
+
+# Columns written by the tabular exporters, in order
+EXPORT_FIELDS = (
+    'url', 'title', 'agency', 'opportunity_number', 'post_date', 'close_date',
+    'amount', 'description', 'eligible_applicants', 'additional_eligibility',
+    'cfda_numbers', 'additional_info_url', 'grants_gov_url', 'is_new',
+    'matched_keywords'
+)
+
+LIST_FIELDS = ('eligible_applicants', 'cfda_numbers', 'matched_keywords')
+
+def export_record(opp):
+    """Structured dict for an Opportunity or detail dict, with every export field"""
+    return Opportunity.from_dict(opp).to_record()
+
+class Exporter:
+    """Append-only writer for one output, fed one opportunity at a time.
+
+    Nothing but the current batch is kept in memory. The output is flushed every
+    flush_every records and on close. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path=None, flush_every=EXPORT_FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, opp):
+        self.write_record(export_record(opp))
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self.flush()
+
+    def write_all(self, opportunities):
+        for opp in opportunities:
+            self.write(opp)
+        return self.count
+
+    def write_record(self, record):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class TextExporter(Exporter):
+    """Base for line-oriented formats, written to a file or to stdout"""
+
+    def __init__(self, path=None, flush_every=EXPORT_FLUSH_EVERY):
+        super().__init__(path, flush_every)
+        if path and path != "-":
+            self.file = open(path, "w", encoding="utf-8", newline="")
+        else:
+            self.file = sys.stdout
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        if self.file is not sys.stdout:
+            self.file.close()
+
+class JsonlExporter(TextExporter):
+    def write_record(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+class CsvExporter(TextExporter):
+    """CSV with one row per opportunity. List fields are joined with "; "."""
+
+    def __init__(self, path=None, flush_every=EXPORT_FLUSH_EVERY):
+        super().__init__(path, flush_every)
+        self.writer = csv.DictWriter(self.file, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write_record(self, record):
+        row = dict(record)
+        for field in LIST_FIELDS:
+            if isinstance(row.get(field), (list, tuple)):
+                row[field] = "; ".join(row[field])
+        self.writer.writerow(row)
+
+class ParquetExporter(Exporter):
+    """Parquet output written one row group per row_group_size records (needs pyarrow).
+
+    flush_every is the text exporters' interval and does not apply: every flush
+    ends a row group, so rows are buffered until a whole group is ready.
+    """
+
+    def __init__(self, path, flush_every=EXPORT_FLUSH_EVERY, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        if not path or path == "-":
+            raise ValueError("Parquet output needs a file path")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+        super().__init__(path, row_group_size)
+        self.pa = pa
+        self.schema = pa.schema([
+            (field, pa.list_(pa.string()) if field in LIST_FIELDS else
+             pa.float64() if field == 'amount' else
+             pa.bool_() if field == 'is_new' else pa.string())
+            for field in EXPORT_FIELDS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch = []
+
+    def write_record(self, record):
+        self.batch.append({field: record.get(field) for field in EXPORT_FIELDS})
+
+    def flush(self):
+        if self.batch:
+            self.writer.write_table(self.pa.Table.from_pylist(self.batch, schema=self.schema))
+            self.batch = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+EXPORTERS = {
+    'jsonl': JsonlExporter,
+    'csv': CsvExporter,
+    'parquet': ParquetExporter
+}
+
+def open_exporter(path=None, format=None, flush_every=EXPORT_FLUSH_EVERY):
+    """Open an exporter, taking the format from the file extension if not given"""
+    if format is None:
+        extension = os.path.splitext(path or "")[1].lstrip(".").lower()
+        format = extension if extension in EXPORTERS else 'jsonl'
+    if format not in EXPORTERS:
+        raise ValueError(f"Unknown export format '{format}', expected one of {tuple(EXPORTERS)}")
+    return EXPORTERS[format](path, flush_every=flush_every)
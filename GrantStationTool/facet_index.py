@@ -0,0 +1,126 @@
+# facet_index.py
+
+# Opportunity field -> SearchFilter field holding the values to match
+FACETS = {
+    'eligible_applicants': 'eligible_applicants',
+    'cfda_numbers': 'cfda_numbers',
+    'agency': 'agencies'
+}
+
+FACET_LABELS = {
+    'eligible_applicants': "Eligible Applicants",
+    'cfda_numbers': "CFDA Numbers",
+    'agency': "Agency"
+}
+
+def facet_key(value):
+    return " ".join(value.split()).casefold()
+
+def facet_values(opp, facet):
+    """The values an opportunity has for a facet, as a list of display strings"""
+    value = opp.get(facet)
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [item for item in value if item and item.strip() and item != "N/A"]
+
+def filter_facets(filter_obj):
+    """{facet: set of normalized values} for the facets a filter restricts"""
+    facets = {}
+    for facet, filter_field in FACETS.items():
+        values = getattr(filter_obj, filter_field, None) or []
+        keys = {facet_key(value) for value in values if value and value.strip()}
+        if keys:
+            facets[facet] = keys
+    return facets
+
+def bit_positions(bits):
+    """Positions of the set bits, lowest first"""
+    # Reading the binary string once is linear, unlike peeling off bits one by one
+    return [i for i, digit in enumerate(reversed(bin(bits)[2:])) if digit == "1"]
+
+def bitset(positions, size):
+    """Build a bitset from positions in one go (OR-ing bits in one at a time
+    copies the growing integer on every step)"""
+    data = bytearray((size + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+def popcount(bits):
+    return bin(bits).count("1")
+
+class FacetIndex:
+    """Facet postings stored as bitsets over a list of opportunities.
+
+    Bit i of a posting is set when opportunity i has that value, so a facet
+    query is an OR of the selected values' bitsets within a facet and an AND
+    across facets, and counts are popcounts.
+    """
+
+    def __init__(self, opportunities=()):
+        self.size = 0
+        # facet -> {normalized value: bitset}
+        self.postings = {facet: {} for facet in FACETS}
+        # facet -> {normalized value: display value}
+        self.labels = {facet: {} for facet in FACETS}
+        self.build(opportunities)
+
+    def build(self, opportunities):
+        """Bulk load opportunities, appending them after any already indexed"""
+        positions = {facet: {} for facet in FACETS}
+        start = self.size
+        for position, opp in enumerate(opportunities, start):
+            for facet in FACETS:
+                for value in facet_values(opp, facet):
+                    key = facet_key(value)
+                    positions[facet].setdefault(key, []).append(position)
+                    self.labels[facet].setdefault(key, value)
+            self.size = position + 1
+        for facet, value_positions in positions.items():
+            postings = self.postings[facet]
+            for key, value_positions in value_positions.items():
+                postings[key] = postings.get(key, 0) | bitset(value_positions, self.size)
+
+    @property
+    def all_bits(self):
+        return (1 << self.size) - 1
+
+    def bits_for(self, facet, values):
+        """Opportunities having any of the (normalized) values for the facet"""
+        postings = self.postings[facet]
+        bits = 0
+        for key in values:
+            bits |= postings.get(key, 0)
+        return bits
+
+    def match(self, filter_obj, bits=None):
+        """Bitset of opportunities passing the filter's facet constraints.
+
+        Returns bits (or every opportunity) unchanged if the filter sets no facets.
+        """
+        return self.match_facets(filter_facets(filter_obj), bits)
+
+    def match_facets(self, facets, bits=None):
+        """Like match, for {facet: normalized values} as built by filter_facets"""
+        bits = self.all_bits if bits is None else bits
+        for facet, keys in facets.items():
+            bits &= self.bits_for(facet, keys)
+            if not bits:
+                break
+        return bits
+
+    def counts(self, bits=None):
+        """{facet: {value: count}} within bits, most common values first"""
+        bits = self.all_bits if bits is None else bits
+        counts = {}
+        for facet, postings in self.postings.items():
+            facet_counts = []
+            for key, posting in postings.items():
+                count = popcount(posting & bits)
+                if count:
+                    facet_counts.append((self.labels[facet][key], count))
+            facet_counts.sort(key=lambda item: (-item[1], item[0]))
+            counts[facet] = dict(facet_counts)
+        return counts
@@ -0,0 +1,206 @@
+# filter_engine.py
+
+from datetime import datetime
+from keyword_matcher import KeywordMatcher
+from opportunity import Opportunity, parse_date, extract_amount
+from facet_index import facet_key, facet_values, filter_facets
+
+def parse_filter_date(value):
+    """Parse a filter's YYYY-MM-DD date, raising ValueError if it is malformed"""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+_UNSET = object()
+
+class PreparedOpportunity:
+    """An opportunity with its searchable text, dates and amount parsed on first use,
+    so several filters can share the work"""
+
+    __slots__ = ('opp', '_text', '_post_date', '_close_date', '_amount', '_facets')
+
+    def __init__(self, opp):
+        self.opp = opp
+        self._text = _UNSET
+        self._facets = None
+        if isinstance(opp, Opportunity):
+            # Already parsed at extraction time
+            self._post_date = opp.post_date
+            self._close_date = opp.close_date
+            self._amount = opp.amount
+        else:
+            self._post_date = _UNSET
+            self._close_date = _UNSET
+            self._amount = _UNSET
+
+    @property
+    def text(self):
+        if self._text is _UNSET:
+            self._text = f"{self.opp.get('title', '')} {self.opp.get('description', '')}".casefold()
+        return self._text
+
+    @property
+    def post_date(self):
+        if self._post_date is _UNSET:
+            self._post_date = parse_date(self.opp.get('post_date'))
+        return self._post_date
+
+    @property
+    def close_date(self):
+        if self._close_date is _UNSET:
+            self._close_date = parse_date(self.opp.get('close_date'))
+        return self._close_date
+
+    @property
+    def amount(self):
+        if self._amount is _UNSET:
+            self._amount = extract_amount(self.opp)
+        return self._amount
+
+    def facet_keys(self, facet):
+        """Normalized values of one facet (agency, eligibility, CFDA numbers)"""
+        if self._facets is None:
+            self._facets = {}
+        keys = self._facets.get(facet)
+        if keys is None:
+            keys = self._facets[facet] = {facet_key(value) for value in facet_values(self.opp, facet)}
+        return keys
+
+def prepare(opp):
+    return opp if isinstance(opp, PreparedOpportunity) else PreparedOpportunity(opp)
+
+FACET_CHECKS = {
+    'eligible_applicants': "eligibility check",
+    'cfda_numbers': "CFDA number check",
+    'agency': "agency check"
+}
+
+class CompiledFilter:
+    """A SearchFilter turned into a predicate, with its keywords and dates prepared once"""
+
+    def __init__(self, filter_obj, whole_word=False):
+        self.filter = filter_obj
+        self.name = filter_obj.name
+        self.matcher = KeywordMatcher(filter_obj.keywords, whole_word=whole_word)
+        self.keywords = self.matcher.keywords
+        # Zero or missing amounts mean "no limit"
+        self.min_amount = filter_obj.min_amount or None
+        self.max_amount = filter_obj.max_amount or None
+        # Facet values a match needs at least one of, e.g. {'agency': {...}}
+        self.facets = filter_facets(filter_obj)
+        opportunity_number = getattr(filter_obj, 'opportunity_number', None) or ""
+        self.opportunity_number = facet_key(opportunity_number) or None
+        self.errors = []
+        self.start_date = self._parse_bound(filter_obj.start_date, "start date")
+        self.end_date = self._parse_bound(filter_obj.end_date, "end date")
+
+    def _parse_bound(self, value, label):
+        try:
+            return parse_filter_date(value)
+        except ValueError as e:
+            # An unreadable bound is ignored rather than rejecting everything
+            self.errors.append(f"Invalid {label} '{value}' in filter '{self.name}': {str(e)}")
+            return None
+
+    def explain(self, opp, keyword_hits=None):
+        """Return the name of the first failed check, or None if the opportunity matches.
+
+        keyword_hits can pass in keywords already found in the opportunity by a
+        shared matcher, so the text is not scanned again.
+        """
+        prepared = prepare(opp)
+
+        if self.keywords:
+            if keyword_hits is None:
+                keyword_hits = self.matcher.find(prepared.text, normalized=True)
+            for kw in self.keywords:
+                if kw not in keyword_hits:
+                    return "keyword match"
+
+        if self.start_date:
+            post_date = prepared.post_date
+            if post_date and post_date < self.start_date:
+                return "start date check"
+
+        if self.end_date:
+            close_date = prepared.close_date
+            if close_date and close_date > self.end_date:
+                return "end date check"
+
+        if self.min_amount is not None or self.max_amount is not None:
+            amount = prepared.amount
+            if amount is not None:
+                if self.min_amount is not None and amount < self.min_amount:
+                    return "minimum amount check"
+                if self.max_amount is not None and amount > self.max_amount:
+                    return "maximum amount check"
+
+        if self.opportunity_number:
+            if facet_key(prepared.opp.get('opportunity_number') or "") != self.opportunity_number:
+                return "opportunity number check"
+
+        for facet, keys in self.facets.items():
+            if keys.isdisjoint(prepared.facet_keys(facet)):
+                return FACET_CHECKS[facet]
+
+        return None
+
+    def explain_listing(self, link):
+        """Return the name of a check a listing row already fails, or None if the
+        opportunity could still match once its details are fetched.
+
+        Only the columns shown in the row can be decided here. Keywords cannot,
+        since they may appear in the description even when the title lacks them.
+        """
+        fields = link.get('fields') or {}
+
+        if self.start_date and fields.get('post_date'):
+            post_date = parse_date(fields['post_date'])
+            if post_date and post_date < self.start_date:
+                return "start date check"
+
+        if self.end_date and fields.get('close_date'):
+            close_date = parse_date(fields['close_date'])
+            if close_date and close_date > self.end_date:
+                return "end date check"
+
+        if 'agency' in self.facets and fields.get('agency'):
+            if facet_key(fields['agency']) not in self.facets['agency']:
+                return FACET_CHECKS['agency']
+
+        return None
+
+    def __call__(self, opp):
+        return self.explain(opp) is None
+
+    def apply(self, opportunities):
+        return [opp for opp in opportunities if self.explain(opp) is None]
+
+def compile_filter(filter_obj, whole_word=False):
+    """Compile a SearchFilter (or pass through an already compiled one)"""
+    if filter_obj is None or isinstance(filter_obj, CompiledFilter):
+        return filter_obj
+    return CompiledFilter(filter_obj, whole_word=whole_word)
+
+def evaluate_filters(filters, opportunities, whole_word=False):
+    """Evaluate several filters in a single pass over the opportunities.
+
+    Each opportunity's text, dates and amount are parsed once and shared by every
+    filter, and one matcher built from the union of all filter keywords scans the
+    text once. Returns {filter name: [matching opportunities]} in input order.
+    """
+    compiled_filters = [compile_filter(filter_obj, whole_word) for filter_obj in filters]
+    matches = {compiled.name: [] for compiled in compiled_filters}
+    matcher = KeywordMatcher(
+        [kw for compiled in compiled_filters for kw in compiled.keywords],
+        whole_word=whole_word
+    )
+
+    for opp in opportunities:
+        prepared = prepare(opp)
+        keyword_hits = matcher.find(prepared.text, normalized=True) if matcher.keywords else None
+        for compiled in compiled_filters:
+            if compiled.explain(prepared, keyword_hits) is None:
+                matches[compiled.name].append(opp)
+
+    return matches
@@ -0,0 +1,191 @@
+# filter_window.py
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from filter_manager import FilterManager, SearchFilter
+
+class FilterWindow:
+    def __init__(self, parent=None, callback=None):
+        self.filter_manager = FilterManager()
+        self.callback = callback
+        
+        # Create new window
+        self.window = tk.Toplevel(parent) if parent else tk.Tk()
+        self.window.title("Search Filters")
+        self.window.geometry("800x820")
+        
+        self.setup_ui()
+        
+    def setup_ui(self):
+        # Create notebook for tabs
+        notebook = ttk.Notebook(self.window)
+        notebook.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Preset Filters Tab
+        preset_frame = ttk.Frame(notebook)
+        notebook.add(preset_frame, text="Preset Filters")
+        self.setup_preset_filters(preset_frame)
+        
+        # Create Filter Tab
+        create_frame = ttk.Frame(notebook)
+        notebook.add(create_frame, text="Create Filter")
+        self.setup_create_filter(create_frame)
+        
+    def setup_preset_filters(self, parent):
+        # List of preset filters
+        self.preset_list = tk.Listbox(parent, width=50, height=10)
+        self.preset_list.pack(pady=10)
+        
+        # Load preset filters
+        for filter_name in self.filter_manager.filters:
+            self.preset_list.insert(tk.END, filter_name)
+            
+        # Buttons frame
+        btn_frame = ttk.Frame(parent)
+        btn_frame.pack(pady=10)
+        
+        ttk.Button(btn_frame, text="Select Filter", 
+                  command=self.select_preset_filter).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Delete Filter", 
+                  command=self.delete_preset_filter).pack(side='left', padx=5)
+                  
+    def setup_create_filter(self, parent):
+        # Filter name
+        ttk.Label(parent, text="Filter Name:").pack(pady=5)
+        self.name_entry = ttk.Entry(parent, width=50)
+        self.name_entry.pack(pady=5)
+        
+        # Keywords
+        ttk.Label(parent, text="Keywords (comma-separated):").pack(pady=5)
+        self.keywords_entry = ttk.Entry(parent, width=50)
+        self.keywords_entry.pack(pady=5)
+        
+        # Amount range
+        amount_frame = ttk.Frame(parent)
+        amount_frame.pack(pady=10)
+        
+        ttk.Label(amount_frame, text="Min Amount: $").pack(side='left')
+        self.min_amount_entry = ttk.Entry(amount_frame, width=15)
+        self.min_amount_entry.pack(side='left', padx=5)
+        
+        ttk.Label(amount_frame, text="Max Amount: $").pack(side='left')
+        self.max_amount_entry = ttk.Entry(amount_frame, width=15)
+        self.max_amount_entry.pack(side='left', padx=5)
+        
+        # Date range
+        date_frame = ttk.Frame(parent)
+        date_frame.pack(pady=10)
+        
+        ttk.Label(date_frame, text="Start Date:").pack(side='left')
+        self.start_date_entry = ttk.Entry(date_frame, width=15)
+        self.start_date_entry.pack(side='left', padx=5)
+        
+        ttk.Label(date_frame, text="End Date:").pack(side='left')
+        self.end_date_entry = ttk.Entry(date_frame, width=15)
+        self.end_date_entry.pack(side='left', padx=5)
+        
+        ttk.Label(parent, text="Date format: YYYY-MM-DD").pack()
+
+        # Facets (values can contain commas, so these are semicolon-separated)
+        ttk.Label(parent, text="Eligible Applicants (semicolon-separated):").pack(pady=5)
+        self.eligibility_entry = ttk.Entry(parent, width=50)
+        self.eligibility_entry.pack(pady=5)
+
+        ttk.Label(parent, text="Opportunity Number:").pack(pady=5)
+        self.opp_number_entry = ttk.Entry(parent, width=50)
+        self.opp_number_entry.pack(pady=5)
+
+        ttk.Label(parent, text="CFDA Numbers (semicolon-separated):").pack(pady=5)
+        self.cfda_entry = ttk.Entry(parent, width=50)
+        self.cfda_entry.pack(pady=5)
+
+        ttk.Label(parent, text="Agencies (semicolon-separated):").pack(pady=5)
+        self.agencies_entry = ttk.Entry(parent, width=50)
+        self.agencies_entry.pack(pady=5)
+        
+        # Save button
+        ttk.Button(parent, text="Save Filter", 
+                  command=self.save_new_filter).pack(pady=20)
+                  
+    def save_new_filter(self):
+        try:
+            name = self.name_entry.get().strip()
+            if not name:
+                raise ValueError("Filter name is required")
+                
+            keywords = [k.strip() for k in self.keywords_entry.get().split(',') if k.strip()]
+            eligible_applicants = [v.strip() for v in self.eligibility_entry.get().split(';') if v.strip()]
+            cfda_numbers = [v.strip() for v in self.cfda_entry.get().split(';') if v.strip()]
+            agencies = [v.strip() for v in self.agencies_entry.get().split(';') if v.strip()]
+            
+            # Parse amounts
+            min_amount = None
+            if self.min_amount_entry.get().strip():
+                min_amount = float(self.min_amount_entry.get())
+                
+            max_amount = None
+            if self.max_amount_entry.get().strip():
+                max_amount = float(self.max_amount_entry.get())
+                
+            # Create new filter
+            new_filter = SearchFilter(
+                name=name,
+                keywords=keywords,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                start_date=self.start_date_entry.get().strip() or None,
+                end_date=self.end_date_entry.get().strip() or None,
+                opportunity_number=self.opp_number_entry.get().strip() or None,
+                eligible_applicants=eligible_applicants,
+                cfda_numbers=cfda_numbers,
+                agencies=agencies
+            )
+            
+            self.filter_manager.add_filter(new_filter)
+            self.preset_list.insert(tk.END, name)
+            messagebox.showinfo("Success", "Filter saved successfully!")
+            
+            # Clear entries
+            self.name_entry.delete(0, tk.END)
+            self.keywords_entry.delete(0, tk.END)
+            self.min_amount_entry.delete(0, tk.END)
+            self.max_amount_entry.delete(0, tk.END)
+            self.start_date_entry.delete(0, tk.END)
+            self.end_date_entry.delete(0, tk.END)
+            self.eligibility_entry.delete(0, tk.END)
+            self.opp_number_entry.delete(0, tk.END)
+            self.cfda_entry.delete(0, tk.END)
+            self.agencies_entry.delete(0, tk.END)
+            
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save filter: {str(e)}")
+            
+    def select_preset_filter(self):
+        selection = self.preset_list.curselection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select a filter")
+            return
+            
+        filter_name = self.preset_list.get(selection[0])
+        selected_filter = self.filter_manager.filters[filter_name]
+        
+        if self.callback:
+            self.callback(selected_filter)
+            self.window.destroy()
+            
+    def delete_preset_filter(self):
+        selection = self.preset_list.curselection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select a filter")
+            return
+            
+        filter_name = self.preset_list.get(selection[0])
+        if messagebox.askyesno("Confirm Delete", 
+                             f"Are you sure you want to delete '{filter_name}'?"):
+            self.filter_manager.remove_filter(filter_name)
+            self.preset_list.delete(selection[0])
+            
+    def run(self):
+        self.window.mainloop()
\ No newline at end of file
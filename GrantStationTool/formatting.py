@@ -0,0 +1,72 @@
+# formatting.py
+
+import textwrap
+from functools import lru_cache
+from config import FORMAT_CACHE_SIZE
+
+def display_fields(opp):
+    """Everything format_opportunity shows for an opportunity, as a hashable tuple"""
+    return (
+        bool(opp.get('is_new')),
+        opp.get('title', 'N/A'),
+        opp.get('agency', 'N/A'),
+        opp.get('opportunity_number', 'N/A'),
+        tuple(opp.get('matched_keywords') or ()),
+        opp.get('post_date', 'N/A'),
+        opp.get('close_date', 'N/A'),
+        opp.get('description', 'No description available.'),
+        tuple(opp.get('eligible_applicants') or ()),
+        tuple(opp.get('cfda_numbers') or ()),
+        opp.get('grants_gov_url'),
+        opp.get('additional_info_url')
+    )
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def render_fields(fields):
+    """Render display_fields() output. Memoized on the field values, so the same
+    opportunity (e.g. in both result tabs) is only formatted once"""
+    (is_new, title, agency, opportunity_number, matched_keywords, post_date, close_date,
+     description, eligible, cfda_numbers, grants_gov_url, additional_info_url) = fields
+
+    parts = ["\n", "=" * 80, "\n"]
+    new_marker = "[NEW] " if is_new else ""
+    parts.append(f"Opportunity Title: {new_marker}{title}\n")
+    parts.append("-" * 40 + "\n\n")
+
+    # Main details
+    parts.append("OVERVIEW\n" + "-" * 8 + "\n")
+    parts.append(f"Agency: {agency}\n")
+    parts.append(f"Opportunity Number: {opportunity_number}\n")
+    if matched_keywords:
+        parts.append(f"Matched Keywords: {', '.join(matched_keywords)}\n")
+    parts.append(f"Post Date: {post_date}\n")
+    parts.append(f"Close Date: {close_date}\n\n")
+
+    # Description, wrapped at 80 characters
+    parts.append("DESCRIPTION\n" + "-" * 11 + "\n")
+    parts.append("\n".join(textwrap.wrap(description, width=80)))
+    parts.append("\n\n")
+
+    # Eligible Applicants
+    parts.append("ELIGIBLE APPLICANTS\n" + "-" * 18 + "\n")
+    if eligible:
+        parts.extend(f"• {applicant}\n" for applicant in eligible)
+    else:
+        parts.append("No eligibility information available.\n")
+    parts.append("\n")
+
+    # Additional Information
+    parts.append("ADDITIONAL INFORMATION\n" + "-" * 21 + "\n")
+    if cfda_numbers:
+        parts.append(f"CFDA Numbers: {', '.join(cfda_numbers)}\n")
+    if grants_gov_url:
+        parts.append(f"Grants.gov URL: {grants_gov_url}\n")
+    if additional_info_url:
+        parts.append(f"Additional Information: {additional_info_url}\n")
+
+    parts.extend(("\n", "=" * 80, "\n"))
+    return "".join(parts)
+
+def format_opportunity(opp):
+    """Format a single opportunity in a readable way"""
+    return render_fields(display_fields(opp))
@@ -0,0 +1,66 @@
+# http_fetcher.py
+
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import BASE_URL, USER_AGENT, COOKIES_FILE, HTTP_POOL_SIZE, HTTP_TIMEOUT
+
+class SessionExpiredError(Exception):
+    """Raised when GrantStation redirects a request to the login page"""
+    pass
+
+class HttpFetcher:
+    """Fetches GrantStation pages as plain HTML using the logged-in session cookies"""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def load_cookies(self, cookies):
+        """Load cookies in the format returned by driver.get_cookies()"""
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/')
+            )
+
+    def load_cookies_from_file(self, path=COOKIES_FILE):
+        try:
+            with open(path, 'r') as f:
+                self.load_cookies(json.load(f))
+                return True
+        except FileNotFoundError:
+            print("No saved cookies found")
+            return False
+        except Exception as e:
+            print(f"Error loading cookies: {str(e)}")
+            return False
+
+    def get_html(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if "user/login" in response.url.lower():
+            raise SessionExpiredError(f"Session expired while fetching {url}")
+        return response.text
+
+    def is_logged_in(self):
+        try:
+            self.get_html(BASE_URL)
+            return True
+        except SessionExpiredError:
+            return False
+        except Exception as e:
+            print(f"Error checking session: {str(e)}")
+            return False
+
+    def close(self):
+        self.session.close()
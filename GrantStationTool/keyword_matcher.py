@@ -0,0 +1,112 @@
+# keyword_matcher.py
+
+import re
+from collections import deque
+
+# Above this many keywords a single automaton scan beats one substring scan per keyword
+AUTOMATON_THRESHOLD = 150
+
+def is_word_char(char):
+    return char.isalnum() or char == '_'
+
+class KeywordMatcher:
+    """Finds which of a set of keywords occur in a text.
+
+    Large keyword sets are compiled into an Aho-Corasick automaton so each text is
+    scanned once no matter how many keywords there are. Small sets use one
+    C-level substring search per unique keyword, which is faster below
+    AUTOMATON_THRESHOLD keywords.
+
+    Keywords and text are case-folded unless case_sensitive is set. With
+    whole_word, a keyword only counts when it is not part of a longer word.
+    """
+
+    def __init__(self, keywords, whole_word=False, case_sensitive=False,
+                 use_automaton=None):
+        self.whole_word = whole_word
+        self.case_sensitive = case_sensitive
+        self.keywords = tuple(dict.fromkeys(
+            self.normalize(kw) for kw in keywords if kw and kw.strip()
+        ))
+        if use_automaton is None:
+            use_automaton = len(self.keywords) > AUTOMATON_THRESHOLD
+        self.use_automaton = use_automaton
+
+        if self.use_automaton:
+            self._build_automaton()
+        elif whole_word:
+            self.patterns = [
+                (kw, re.compile(r'(?<!\w)' + re.escape(kw) + r'(?!\w)'))
+                for kw in self.keywords
+            ]
+
+    def normalize(self, text):
+        return text if self.case_sensitive else text.casefold()
+
+    def _build_automaton(self):
+        # Trie of all keywords
+        goto = [{}]
+        outputs = [[]]
+        for kw in self.keywords:
+            state = 0
+            for char in kw:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    goto.append({})
+                    outputs.append([])
+                    next_state = len(goto) - 1
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state].append(kw)
+
+        # Failure links, then fold them into a full transition table so scanning
+        # never has to walk the failure chain
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+        self.transitions = transitions
+        self.outputs = [tuple(out) for out in outputs]
+
+    def find(self, text, normalized=False):
+        """Return the set of (normalized) keywords that occur in text.
+
+        Pass normalized=True if text has already been case-folded to match.
+        """
+        if not self.keywords or not text:
+            return set()
+        if not normalized:
+            text = self.normalize(text)
+
+        if not self.use_automaton:
+            if self.whole_word:
+                return {kw for kw, pattern in self.patterns if pattern.search(text)}
+            return {kw for kw in self.keywords if kw in text}
+
+        hits = set()
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for kw in outputs[state]:
+                    if not self.whole_word or self._is_whole_word(text, index, len(kw)):
+                        hits.add(kw)
+        return hits
+
+    def _is_whole_word(self, text, end_index, length):
+        start = end_index - length + 1
+        if start > 0 and is_word_char(text[start - 1]):
+            return False
+        if end_index + 1 < len(text) and is_word_char(text[end_index + 1]):
+            return False
+        return True
@@ -2,13 +2,13 @@
 
 from search_interface import SearchInterface
 from scraper import GrantStationScraper
-from results_window import ResultsWindow
 from config import USERNAME, PASSWORD
 
-def start_new_search():
-    """Initialize a new search session"""
-    scraper = GrantStationScraper(USERNAME, PASSWORD)
-    search_ui = SearchInterface(scraper.run)
+def start_new_search(scraper=None):
+    """Initialize a new search session, reusing the scraper's warm drivers if given"""
+    if scraper is None:
+        scraper = GrantStationScraper(USERNAME, PASSWORD)
+    search_ui = SearchInterface(scraper.search, scraper.show_results, scraper.cancel)
     search_ui.run()
 
 if __name__ == "__main__":
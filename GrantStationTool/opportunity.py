@@ -0,0 +1,218 @@
+# opportunity.py
+
+import re
+import sys
+from datetime import date
+from functools import lru_cache
+
+# Date formats seen in opportunity fields, in the order they are tried
+DATE_PATTERNS = [
+    (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})'), ('month', 'day', 'year')),
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'), ('year', 'month', 'day')),
+]
+
+# Dollar figures in text: "$1,500,000", "$50000", "$2.5"
+AMOUNT_NUMBER = r'\$(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?'
+
+# Common patterns for money amounts in text, in the order they are tried. The
+# first only matches a figure directly followed by "million" or "M", the one
+# case where the amount is scaled to millions
+AMOUNT_PATTERNS = [
+    re.compile(AMOUNT_NUMBER + r'\s*(?:[Mm]illion|M)\b'),  # Matches $X million or $XM
+    re.compile(AMOUNT_NUMBER),  # Matches standard currency format
+]
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    """Parse an opportunity date (MM/DD/YYYY, YYYY-MM-DD or DD/MM/YYYY) into a date.
+
+    Field text may still carry its label (e.g. "Post Date\\n10/31/2024"), so the
+    first date-looking substring is used. Returns None when nothing parses.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    for pattern, order in DATE_PATTERNS:
+        match = pattern.search(value)
+        if not match:
+            continue
+        parts = dict(zip(order, (int(group) for group in match.groups())))
+        try:
+            return date(parts['year'], parts['month'], parts['day'])
+        except ValueError:
+            # Fall back to day-first for dates like 31/10/2024
+            try:
+                return date(parts['year'], parts['day'], parts['month'])
+            except ValueError:
+                return None
+    return None
+
+def extract_amount(opp):
+    """Funding amount of an opportunity: its 'amount' field if set, otherwise the
+    first dollar figure in the title or description"""
+    if opp.get('amount') is not None:
+        try:
+            return float(opp['amount'])
+        except (ValueError, TypeError):
+            pass
+
+    text_to_search = f"{opp.get('title', '')} {opp.get('description', '')}"
+
+    for multiplier, pattern in zip((1_000_000, 1), AMOUNT_PATTERNS):
+        match = pattern.search(text_to_search)
+        if match:
+            whole, fraction = match.groups()
+            try:
+                amount = float(whole.replace(',', '') + (f".{fraction}" if fraction else ""))
+            except ValueError:
+                continue
+            return amount * multiplier
+
+    return None
+
+def clean_text(value):
+    """Field text with the scraper's "N/A" placeholder turned into None"""
+    if value is None or value == "N/A":
+        return None
+    return value
+
+def intern_text(value):
+    value = clean_text(value)
+    return sys.intern(value) if value else value
+
+class Opportunity:
+    """An extracted opportunity, with dates and amount parsed once at extraction time.
+
+    Supports dict-style reads (opp.get('agency'), opp['title']) returning the
+    display values the formatters expect, so it can stand in for the detail dict.
+    """
+
+    __slots__ = (
+        'url', 'title', 'description', 'agency', 'opportunity_number',
+        'post_date_text', 'close_date_text', 'post_date', 'close_date', 'amount',
+        'eligible_applicants', 'additional_eligibility', 'cfda_numbers',
+        'additional_info_url', 'grants_gov_url', 'is_new', 'matched_keywords'
+    )
+
+    # Dict keys whose display value is stored under a different attribute
+    KEY_ATTRIBUTES = {
+        'post_date': 'post_date_text',
+        'close_date': 'close_date_text',
+    }
+
+    # Text fields shown as "N/A" when missing
+    TEXT_FIELDS = (
+        'title', 'description', 'agency', 'opportunity_number',
+        'post_date', 'close_date', 'additional_eligibility'
+    )
+
+    def __init__(self, url=None, title=None, description=None, agency=None,
+                 opportunity_number=None, post_date=None, close_date=None,
+                 eligible_applicants=(), additional_eligibility=None, cfda_numbers=(),
+                 additional_info_url=None, grants_gov_url=None, amount=None, is_new=False,
+                 matched_keywords=None):
+        self.url = url
+        self.title = clean_text(title)
+        self.description = clean_text(description)
+        self.agency = intern_text(agency)
+        self.opportunity_number = clean_text(opportunity_number)
+        self.post_date_text = clean_text(post_date)
+        self.close_date_text = clean_text(close_date)
+        self.post_date = parse_date(self.post_date_text)
+        self.close_date = parse_date(self.close_date_text)
+        self.eligible_applicants = tuple(intern_text(item) for item in eligible_applicants if item)
+        self.additional_eligibility = clean_text(additional_eligibility)
+        self.cfda_numbers = tuple(intern_text(item) for item in cfda_numbers if item)
+        self.additional_info_url = additional_info_url
+        self.grants_gov_url = grants_gov_url
+        self.amount = amount if amount is not None else extract_amount(self)
+        self.is_new = is_new
+        # Search keywords whose listings contained this opportunity
+        self.matched_keywords = list(matched_keywords or [])
+
+    @classmethod
+    def from_dict(cls, data, url=None):
+        """Build from a detail dict as returned by extract_detailed_info"""
+        if isinstance(data, cls):
+            return data
+        amount = data.get('amount')
+        try:
+            amount = float(amount) if amount is not None else None
+        except (ValueError, TypeError):
+            amount = None
+        return cls(
+            url=data.get('url', url),
+            title=data.get('title'),
+            description=data.get('description'),
+            agency=data.get('agency'),
+            opportunity_number=data.get('opportunity_number'),
+            post_date=data.get('post_date'),
+            close_date=data.get('close_date'),
+            eligible_applicants=data.get('eligible_applicants') or (),
+            additional_eligibility=data.get('additional_eligibility'),
+            cfda_numbers=data.get('cfda_numbers') or (),
+            additional_info_url=data.get('additional_info_url'),
+            grants_gov_url=data.get('grants_gov_url'),
+            amount=amount,
+            is_new=data.get('is_new', False),
+            matched_keywords=data.get('matched_keywords')
+        )
+
+    def to_dict(self):
+        """Plain dict in the detail dict's shape, for caching (see to_record for export)"""
+        data = {
+            'url': self.url,
+            'title': self['title'],
+            'description': self['description'],
+            'agency': self['agency'],
+            'opportunity_number': self['opportunity_number'],
+            'post_date': self['post_date'],
+            'close_date': self['close_date'],
+            'eligible_applicants': list(self.eligible_applicants),
+            'additional_eligibility': self['additional_eligibility'],
+            'cfda_numbers': list(self.cfda_numbers),
+            'additional_info_url': self.additional_info_url,
+            'is_new': self.is_new
+        }
+        if self.grants_gov_url:
+            data['grants_gov_url'] = self.grants_gov_url
+        if self.amount is not None:
+            data['amount'] = self.amount
+        if self.matched_keywords:
+            data['matched_keywords'] = list(self.matched_keywords)
+        return data
+
+    def to_record(self):
+        """Structured dict for export: missing values are None rather than "N/A",
+        and dates are ISO strings parsed from the field text"""
+        return {
+            'url': self.url,
+            'title': self.title,
+            'agency': self.agency,
+            'opportunity_number': self.opportunity_number,
+            'post_date': self.post_date.isoformat() if self.post_date else None,
+            'close_date': self.close_date.isoformat() if self.close_date else None,
+            'amount': self.amount,
+            'description': self.description,
+            'eligible_applicants': list(self.eligible_applicants),
+            'additional_eligibility': self.additional_eligibility,
+            'cfda_numbers': list(self.cfda_numbers),
+            'additional_info_url': self.additional_info_url or None,
+            'grants_gov_url': self.grants_gov_url or None,
+            'is_new': bool(self.is_new),
+            'matched_keywords': list(self.matched_keywords)
+        }
+
+    def get(self, key, default=None):
+        value = getattr(self, self.KEY_ATTRIBUTES.get(key, key), None)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in self.__slots__ and key not in self.KEY_ATTRIBUTES:
+            raise KeyError(key)
+        value = self.get(key)
+        if value is None and key in self.TEXT_FIELDS:
+            return "N/A"
+        return value
+
+    def __repr__(self):
+        return f"Opportunity({self.title!r}, {self.url!r})"
@@ -0,0 +1,104 @@
+# opportunity_cache.py
+
+import json
+import sqlite3
+import threading
+import time
+from config import CACHE_FILE, CACHE_TTL_HOURS, CACHE_MAX_ENTRIES
+
+class OpportunityCache:
+    """SQLite cache of extracted opportunity details, keyed by detail page URL.
+
+    Entries older than the TTL are treated as missing, and the least recently
+    used entries are evicted once the cache grows past max_entries. on_evict, if
+    given, is called with the evicted URLs so other stores can drop them too.
+    """
+
+    EVICT_EVERY = 50
+
+    def __init__(self, path=CACHE_FILE, ttl_hours=CACHE_TTL_HOURS, max_entries=CACHE_MAX_ENTRIES,
+                 on_evict=None):
+        self.on_evict = on_evict
+        self.ttl = ttl_hours * 3600 if ttl_hours else None
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.writes_since_evict = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS opportunities ("
+                "url TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_opportunities_accessed ON opportunities (accessed_at)"
+            )
+
+    def get(self, url, ignore_ttl=False):
+        """Return the cached detail dict for url, or None if it is missing or stale.
+
+        With ignore_ttl, stale entries are returned too.
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, fetched_at FROM opportunities WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, fetched_at = row
+            if self.ttl and not ignore_ttl and now - fetched_at > self.ttl:
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE opportunities SET accessed_at = ? WHERE url = ?", (now, url)
+                )
+        return json.loads(data)
+
+    def load_all(self):
+        """Every cached detail dict, stale or not, with its URL filled in"""
+        with self.lock:
+            rows = self.conn.execute("SELECT url, data FROM opportunities ORDER BY fetched_at").fetchall()
+        opportunities = []
+        for url, data in rows:
+            detailed_info = json.loads(data)
+            detailed_info.setdefault('url', url)
+            opportunities.append(detailed_info)
+        return opportunities
+
+    def put(self, url, detailed_info):
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO opportunities (url, data, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (url, json.dumps(detailed_info), now, now)
+                )
+            self.writes_since_evict += 1
+            if self.writes_since_evict >= self.EVICT_EVERY:
+                self._evict()
+
+    def _evict(self):
+        self.writes_since_evict = 0
+        if not self.max_entries:
+            return
+        count = self.conn.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            evicted = [row[0] for row in self.conn.execute(
+                "SELECT url FROM opportunities ORDER BY accessed_at LIMIT ?", (excess,)
+            ).fetchall()]
+            with self.conn:
+                self.conn.executemany("DELETE FROM opportunities WHERE url = ?",
+                                      [(url,) for url in evicted])
+            if self.on_evict:
+                try:
+                    self.on_evict(evicted)
+                except Exception as e:
+                    print(f"Error dropping evicted opportunities: {str(e)}")
+
+    def close(self):
+        with self.lock:
+            self._evict()
+            self.conn.close()
@@ -0,0 +1,101 @@
+# opportunity_index.py
+
+from bisect import bisect_left, bisect_right
+from filter_engine import compile_filter
+from opportunity import Opportunity
+from facet_index import FacetIndex, bit_positions
+
+class RangeIndex:
+    """Sorted secondary index over one field, answering range lookups with bisect.
+
+    Entries with no value are kept apart, since filters let opportunities with a
+    missing date or amount through.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.missing = []
+
+    def build(self, values):
+        """Bulk load from an iterable of (value, position) pairs"""
+        self.entries = sorted((value, position) for value, position in values if value is not None)
+        self.missing = [position for value, position in values if value is None]
+
+    def span(self, low=None, high=None):
+        """Index bounds in entries of values within [low, high]"""
+        start = 0 if low is None else bisect_left(self.entries, (low,))
+        # (high, inf) sorts after every (high, position) pair
+        end = len(self.entries) if high is None else bisect_right(self.entries, (high, float('inf')))
+        return start, max(start, end)
+
+    def count(self, low=None, high=None, include_missing=True):
+        start, end = self.span(low, high)
+        return end - start + (len(self.missing) if include_missing else 0)
+
+    def positions(self, low=None, high=None, include_missing=True):
+        start, end = self.span(low, high)
+        positions = {position for value, position in self.entries[start:end]}
+        if include_missing:
+            positions.update(self.missing)
+        return positions
+
+class OpportunityIndex:
+    """In-memory store of opportunities with sorted post date, close date and
+    amount indexes and facet bitsets, so date, amount and facet filters resolve
+    without a full scan"""
+
+    def __init__(self, opportunities=()):
+        self.opportunities = [Opportunity.from_dict(opp) for opp in opportunities]
+        self.post_dates = RangeIndex()
+        self.close_dates = RangeIndex()
+        self.amounts = RangeIndex()
+        self.facets = FacetIndex(self.opportunities)
+        self.post_dates.build([(opp.post_date, i) for i, opp in enumerate(self.opportunities)])
+        self.close_dates.build([(opp.close_date, i) for i, opp in enumerate(self.opportunities)])
+        self.amounts.build([(opp.amount, i) for i, opp in enumerate(self.opportunities)])
+
+    def __len__(self):
+        return len(self.opportunities)
+
+    def candidates(self, compiled_filter):
+        """Positions that can satisfy the filter's date, amount and facet
+        constraints, or None if the filter has none"""
+        ranges = []
+        if compiled_filter.start_date:
+            ranges.append((self.post_dates, compiled_filter.start_date, None))
+        if compiled_filter.end_date:
+            ranges.append((self.close_dates, None, compiled_filter.end_date))
+        if compiled_filter.min_amount is not None or compiled_filter.max_amount is not None:
+            ranges.append((self.amounts, compiled_filter.min_amount, compiled_filter.max_amount))
+        candidates = None
+        if compiled_filter.facets:
+            candidates = set(bit_positions(self.facets.match_facets(compiled_filter.facets)))
+            if not candidates:
+                return candidates
+        if not ranges:
+            return candidates
+
+        # Intersect starting from the most selective range
+        ranges.sort(key=lambda r: r[0].count(r[1], r[2]))
+        for index, low, high in ranges:
+            positions = index.positions(low, high)
+            candidates = positions if candidates is None else candidates & positions
+            if not candidates:
+                break
+        return candidates
+
+    def query(self, filter_obj):
+        """Opportunities matching filter_obj, in corpus order"""
+        compiled_filter = compile_filter(filter_obj)
+        candidates = None if compiled_filter is None else self.candidates(compiled_filter)
+        if candidates is None:
+            candidates = range(len(self.opportunities))
+        else:
+            candidates = sorted(candidates)
+
+        # The range and facet indexes are exact, so only keyword and opportunity
+        # number checks are left to run
+        opportunities = self.opportunities
+        if compiled_filter is None or not (compiled_filter.keywords or compiled_filter.opportunity_number):
+            return [opportunities[i] for i in candidates]
+        return [opportunities[i] for i in candidates if compiled_filter(opportunities[i])]
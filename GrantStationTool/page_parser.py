@@ -0,0 +1,136 @@
+# page_parser.py
+
+import re
+import hashlib
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, NavigableString
+from config import BASE_URL
+
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'
+}
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Listing columns that can be read before the detail page is loaded, as
+# (views-field class fragment, detail field) pairs
+LISTING_COLUMNS = (
+    ('post-date', 'post_date'),
+    ('posted', 'post_date'),
+    ('close-date', 'close_date'),
+    ('due-date', 'close_date'),
+    ('deadline', 'close_date'),
+    ('agency', 'agency')
+)
+
+def make_soup(html):
+    return BeautifulSoup(html, "html.parser")
+
+def element_text(element):
+    """Return element text the way Selenium's element.text reports it"""
+    if element is None:
+        return None
+    parts = []
+    for node in element.descendants:
+        if type(node) is NavigableString:
+            if node.parent.name not in ('script', 'style'):
+                parts.append(WHITESPACE_RE.sub(" ", node))
+        elif node.name in BLOCK_TAGS:
+            parts.append("\n")
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def select_text(soup, selector, attribute=None):
+    element = soup.select_one(selector)
+    if element is None:
+        return None
+    if attribute:
+        return element.get(attribute)
+    return element_text(element)
+
+def select_link(soup, selector, base_url=BASE_URL):
+    element = soup.select_one(selector)
+    if element is None or not element.get('href'):
+        return None
+    return urljoin(base_url, element['href'])
+
+def select_items(soup, selector):
+    return [element_text(elem) for elem in soup.select(selector)]
+
+def parse_opportunity_links(html, base_url=BASE_URL):
+    """Parse the opportunity links from a search listing page"""
+    return parse_listing_page(html, base_url)[0]
+
+def row_hash(element):
+    """Fingerprint the listing row containing element, to detect changed listings"""
+    row = element.find_parent("tr") or element
+    return hashlib.sha1(element_text(row).encode("utf-8")).hexdigest()
+
+def row_fields(element):
+    """Read the dates and agency shown in the listing row containing element"""
+    row = element.find_parent("tr")
+    fields = {}
+    if row is None:
+        return fields
+    for cell in row.select("td[class*='views-field-']"):
+        classes = " ".join(cell.get('class', []))
+        for fragment, name in LISTING_COLUMNS:
+            if fragment in classes:
+                text = element_text(cell)
+                if text and name not in fields:
+                    fields[name] = text
+                break
+    return fields
+
+def parse_listing_page(html, base_url=BASE_URL):
+    """Parse a search listing page into its opportunity links and the next page URL"""
+    soup = make_soup(html)
+    links = []
+    for element in soup.select("td.views-field-title a"):
+        href = element.get('href')
+        if href:
+            links.append({
+                'url': urljoin(base_url, href),
+                'title': element_text(element),
+                'row_hash': row_hash(element),
+                'fields': row_fields(element)
+            })
+
+    next_page_url = (
+        select_link(soup, "li.pager__item--next a", base_url) or
+        select_link(soup, "a[rel='next']", base_url)
+    )
+    return links, next_page_url
+
+def parse_detailed_info(html, url=BASE_URL):
+    """Parse an opportunity detail page into the same dict the Selenium extractor builds"""
+    soup = make_soup(html)
+
+    title = (
+        select_text(soup, "h1.page-header") or
+        select_text(soup, "meta[property='og:title']", attribute='content') or
+        select_text(soup, "div.views-field-title") or
+        "Title Not Found"
+    )
+
+    detailed_info = {
+        'title': title,
+        'description': select_text(soup, "div.field--name-field-description") or "N/A",
+        'agency': select_text(soup, "div.field--name-field-agency-name") or "N/A",
+        'opportunity_number': select_text(soup, "div.field--name-field-funding-opportunity-number") or "N/A",
+        'post_date': select_text(soup, "div.field--name-field-post-date") or "N/A",
+        'close_date': select_text(soup, "div.field--name-field-close-date") or "N/A",
+        'eligible_applicants': select_items(soup, "div#elig-app-in-profile .field__item"),
+        'additional_eligibility': select_text(soup, "div#add-elig-in-profile") or "N/A",
+        'cfda_numbers': select_items(soup, "div#cfda-numbers-in-profile .field__item"),
+        'additional_info_url': select_link(soup, "div.field--name-field-additional-information a", url)
+    }
+
+    # Add grants.gov link if present
+    grants_gov_link = select_link(soup, "div.visit-website-link a", url)
+    if grants_gov_link:
+        detailed_info['grants_gov_url'] = grants_gov_link
+
+    return detailed_info
@@ -0,0 +1,69 @@
+# query_planner.py
+
+import urllib.parse
+from config import SEARCH_URL_TEMPLATE, MAX_PLANNED_QUERIES
+
+def search_keyword(url):
+    """The keyword a search URL asks for, or an empty string"""
+    return urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get('keyword', [''])[0]
+
+def search_url(keyword="", opp_number="", cfda=""):
+    """Build a site search URL, leaving unused parameters blank"""
+    return SEARCH_URL_TEMPLATE.format(
+        keyword=urllib.parse.quote(keyword or ""),
+        opp_number=urllib.parse.quote(opp_number or ""),
+        cfda=urllib.parse.quote(cfda or "")
+    )
+
+def most_selective(keywords):
+    """The keyword likely to match the fewest listings: the one with the most
+    words, then the longest"""
+    return max(keywords, key=lambda kw: (len(kw.split()), len(kw)))
+
+def plan_search_urls(keyword=None, search_filter=None, max_queries=MAX_PLANNED_QUERIES):
+    """Turn a search keyword and SearchFilter into the search URLs to crawl.
+
+    The site takes one keyword, one opportunity number and one CFDA number per
+    query. A typed keyword is always sent. Without one, the filter's most
+    selective keyword is sent: an opportunity has to contain every filter
+    keyword, so any one of them already finds all the matches, and the rest
+    are checked locally. A filter matches any of its CFDA numbers, so each is
+    its own query and the listings are merged afterwards; past max_queries they
+    are left to the local check too. Each URL returns a superset of the
+    filter's matches, and the filter is still applied locally.
+    """
+    keyword = (keyword or "").strip()
+    filter_keywords = [kw.strip() for kw in getattr(search_filter, 'keywords', None) or [] if kw and kw.strip()]
+    cfda_numbers = [cfda.strip() for cfda in getattr(search_filter, 'cfda_numbers', None) or [] if cfda and cfda.strip()]
+    opp_number = (getattr(search_filter, 'opportunity_number', None) or "").strip()
+
+    if not keyword and filter_keywords:
+        keyword = most_selective(filter_keywords)
+    cfdas = list(dict.fromkeys(cfda_numbers)) or [""]
+    if max_queries and len(cfdas) > max_queries:
+        cfdas = [""]
+
+    return [search_url(keyword, opp_number, cfda) for cfda in cfdas]
+
+def split_keywords(text):
+    """Split a semicolon- or newline-separated keyword list"""
+    return [kw.strip() for kw in text.replace("\n", ";").split(";") if kw.strip()]
+
+def load_keywords(path):
+    """Read one keyword per line from a file, skipping blank lines and # comments"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+def plan_batch_urls(keywords, search_filter=None, max_queries=MAX_PLANNED_QUERIES):
+    """Search URLs for a batch of keywords, each planned as in plan_search_urls.
+
+    The search merges the listings and fetches each opportunity once, so
+    keywords that find the same grant do not cost extra detail loads.
+    """
+    keywords = list(dict.fromkeys(kw.strip() for kw in keywords if kw and kw.strip()))
+    if not keywords:
+        return plan_search_urls(None, search_filter, max_queries)
+    urls = []
+    for keyword in keywords:
+        urls.extend(plan_search_urls(keyword, search_filter, max_queries))
+    return list(dict.fromkeys(urls))
@@ -0,0 +1,76 @@
+# ranking.py
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from text_index import document_terms, tokenize
+from config import TOP_K_RESULTS
+
+def query_terms(*queries):
+    """Unique search terms from any mix of strings and lists of keywords"""
+    terms = []
+    for query in queries:
+        if not query:
+            continue
+        if isinstance(query, str):
+            query = [query]
+        for text in query:
+            terms.extend(tokenize(text))
+    return list(dict.fromkeys(terms))
+
+class TermStatistics:
+    """BM25 term statistics for a fixed set of opportunities.
+
+    Term frequencies, document lengths and document frequencies are computed
+    once, so any number of queries can be scored against the same set.
+    """
+
+    def __init__(self, opportunities, k1=1.2, b=0.75):
+        self.opportunities = list(opportunities)
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths = []
+        # term -> [(position, term frequency)]
+        self.postings = defaultdict(list)
+        for position, opp in enumerate(self.opportunities):
+            terms = document_terms(opp)
+            self.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings[term].append((position, tf))
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0
+
+    def idf(self, term):
+        n = len(self.opportunities)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, terms):
+        """BM25 score of every opportunity containing at least one term, by position"""
+        scores = Counter()
+        k1, b, avg_length = self.k1, self.b, self.avg_length or 1
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for position, tf in postings:
+                norm = k1 * (1 - b + b * self.doc_lengths[position] / avg_length)
+                scores[position] += idf * tf * (k1 + 1) / (tf + norm)
+        return scores
+
+    def top_k(self, terms, k=TOP_K_RESULTS):
+        """The k best-scoring (score, opportunity) pairs, best first.
+
+        Uses a bounded heap rather than sorting every scored opportunity. Equal
+        scores keep their original listing order.
+        """
+        scores = self.scores(terms)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, self.opportunities[position]) for position, score in best]
+
+def rank(opportunities, terms, k=TOP_K_RESULTS):
+    """The k most relevant opportunities for terms as (score, opportunity) pairs,
+    or an empty list when there are no terms to rank by"""
+    if not terms:
+        return []
+    return TermStatistics(opportunities).top_k(terms, k)
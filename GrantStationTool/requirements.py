@@ -1,3 +1,4 @@
 selenium==4.11.2
 webdriver-manager==4.0.0
-requests==2.31.0
\ No newline at end of file
+requests==2.31.0
+beautifulsoup4==4.12.2
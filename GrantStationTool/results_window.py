@@ -2,16 +2,50 @@
 
 import tkinter as tk
 from tkinter import ttk
+from facet_index import FACET_LABELS, FacetIndex
+from exporters import export_record
+from filter_manager import FilterManager
+from opportunity_index import OpportunityIndex
+from ranking import query_terms, rank
+
+# Result rows added to a list per pass of the Tk event loop
+RENDER_CHUNK_SIZE = 200
+
+NO_FILTER = "(no filter)"
 
 class ResultsWindow:
     def __init__(self, filtered_results, all_results, debug_text="", debug_mode=False, 
-                 on_new_search=None, on_save_results=None):
-        self.filtered_results = filtered_results
-        self.all_results = all_results
+                 on_new_search=None, on_save_results=None, filter_counts=None,
+                 ranked_results=None, facet_counts=None, format_opportunity=None,
+                 current_filter=None, skipped_listings=0, search_keywords=None):
+        # Lists of opportunities (Opportunity objects or detail dicts)
+        self.filtered_results = list(filtered_results or [])
+        self.all_results = list(all_results or [])
+        self.new_count = sum(1 for opp in self.filtered_results if opp.get('is_new'))
         self.debug_text = debug_text
         self.debug_mode = debug_mode
         self.on_new_search = on_new_search
         self.on_save_results = on_save_results
+        self.filter_counts = filter_counts or {}
+        self.ranked_results = ranked_results or []
+        # Keywords the search was run with, to re-rank after a re-filter
+        self.search_keywords = search_keywords or []
+        self.facet_counts = facet_counts or {}
+        self.format_opportunity = format_opportunity
+        self.current_filter = current_filter
+        # Listings the search's filter ruled out without fetching them. They are
+        # missing from all_results, so re-filtering those would undercount
+        self.skipped_listings = skipped_listings
+        self.filter_manager = FilterManager()
+        # Built on the first re-filter and reused for every one after it
+        self.opportunity_index = None
+        self.filtered_tab = None
+        self.facets_tree = None
+        self.ranked_tree = None
+        self.ranked_label = None
+        self.tabs = []
+        self.render_scheduled = False
+        self.window = None
 
     def display(self):
         """Display results in a tkinter window"""
@@ -25,6 +59,9 @@ class ResultsWindow:
         main_frame = ttk.Frame(self.window, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
+        # Re-filter the fetched opportunities without searching again
+        self.setup_filter_bar(main_frame)
+
         # Add notebook for tabs
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -39,6 +76,23 @@ class ResultsWindow:
         notebook.add(all_results_frame, text="All Results")
         self.setup_results_tab(all_results_frame, self.all_results, is_filtered=False)
 
+        # Best matches by relevance, re-ranked whenever the results are re-filtered
+        ranked_frame = ttk.Frame(notebook)
+        notebook.add(ranked_frame, text="Top Matches")
+        self.setup_ranked_tab(ranked_frame)
+
+        # Saved filter counts tab
+        if self.filter_counts:
+            counts_frame = ttk.Frame(notebook)
+            notebook.add(counts_frame, text="Saved Filters")
+            self.setup_filter_counts_tab(counts_frame)
+
+        # Facet counts tab
+        if any(self.facet_counts.values()):
+            facets_frame = ttk.Frame(notebook)
+            notebook.add(facets_frame, text="Facets")
+            self.setup_facets_tab(facets_frame)
+
         # Debug tab (if debug mode is on)
         if self.debug_mode:
             debug_frame = ttk.Frame(notebook)
@@ -52,7 +106,7 @@ class ResultsWindow:
         save_results_button = ttk.Button(
             button_frame, 
             text="Save Results", 
-            command=self.on_save_results
+            command=self.handle_save_results
         )
         save_results_button.pack(side="left", padx=5)
         
@@ -63,52 +117,288 @@ class ResultsWindow:
         )
         new_search_button.pack(side="left", padx=5)
         
+        self.schedule_render()
         self.window.mainloop()
 
-    def setup_results_tab(self, parent, results_text, is_filtered=False):
-        """Setup a results tab with text widget and scrollbar"""
+    def setup_results_tab(self, parent, results, is_filtered=False):
+        """Setup a results tab: a list of opportunities with a detail pane for the selected one.
+
+        Rows are added RENDER_CHUNK_SIZE at a time between Tk events, so the
+        window opens at once however many results there are.
+        """
         # Create main container
         main_container = ttk.Frame(parent)
         main_container.pack(fill="both", expand=True)
 
         # Add summary at top if this is the filtered results
+        summary_label = None
         if is_filtered:
             summary_frame = ttk.Frame(main_container)
             summary_frame.pack(fill="x", pady=(5, 10), padx=10)
-            
-            filtered_count = results_text.count("Opportunity Title:")
-            total_count = self.all_results.count("Opportunity Title:")
-            
-            summary_text = (f"Found {filtered_count} matching opportunities "
-                          f"out of {total_count} total opportunities")
-            ttk.Label(
+            summary_label = ttk.Label(
                 summary_frame, 
-                text=summary_text,
+                text=self.summary_text(),
                 font=('Helvetica', 10, 'bold')
-            ).pack(anchor='w')
+            )
+            summary_label.pack(anchor='w')
 
-        # Create text widget with scrollbar
-        text_frame = ttk.Frame(main_container)
-        text_frame.pack(expand=True, fill="both", padx=10)
-        
-        text_widget = tk.Text(text_frame, wrap="word")
-        scrollbar = ttk.Scrollbar(text_frame)
-        
+        panes = ttk.PanedWindow(main_container, orient=tk.VERTICAL)
+        panes.pack(expand=True, fill="both", padx=10)
+
+        # Opportunity list
+        list_frame = ttk.Frame(panes)
+        columns = ("agency", "close_date", "new")
+        tree = ttk.Treeview(list_frame, columns=columns, show="tree headings", selectmode="browse")
+        tree.heading("#0", text="Opportunity Title")
+        tree.heading("agency", text="Agency")
+        tree.heading("close_date", text="Close Date")
+        tree.heading("new", text="New")
+        tree.column("#0", width=480)
+        tree.column("agency", width=250)
+        tree.column("close_date", anchor="center", width=110)
+        tree.column("new", anchor="center", width=50)
+        tree_scrollbar = ttk.Scrollbar(list_frame, command=tree.yview)
+        tree.configure(yscrollcommand=tree_scrollbar.set)
+        tree_scrollbar.pack(side="right", fill="y")
+        tree.pack(side="left", expand=True, fill="both")
+        panes.add(list_frame, weight=2)
+
+        # Detail pane for the selected opportunity
+        detail_frame = ttk.Frame(panes)
+        text_widget = tk.Text(detail_frame, wrap="word", height=15)
+        scrollbar = ttk.Scrollbar(detail_frame, command=text_widget.yview)
+        text_widget.config(yscrollcommand=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
         text_widget.pack(side="left", expand=True, fill="both")
-        
-        # Configure tags for formatting
-        text_widget.tag_configure('header', font=('Helvetica', 12, 'bold'))
-        text_widget.tag_configure('subheader', font=('Helvetica', 10, 'bold'))
-        text_widget.tag_configure('normal', font=('Helvetica', 10))
-        text_widget.tag_configure('separator', font=('Helvetica', 10), spacing3=20)
-        
-        text_widget.insert("1.0", results_text)
-        scrollbar.config(command=text_widget.yview)
-        text_widget.config(yscrollcommand=scrollbar.set)
-        
-        # Make text widget read-only
         text_widget.configure(state='disabled')
+        panes.add(detail_frame, weight=1)
+
+        tab = {'results': results, 'tree': tree, 'rendered': 0, 'summary': summary_label}
+        tree.bind("<<TreeviewSelect>>", lambda e: self.show_details(tab, text_widget))
+        self.tabs.append(tab)
+        if is_filtered:
+            self.filtered_tab = tab
+
+    def setup_filter_bar(self, parent):
+        """Setup the saved filter picker used to re-filter the results in place"""
+        filter_frame = ttk.Frame(parent)
+        filter_frame.pack(fill="x", pady=(0, 10))
+
+        ttk.Label(filter_frame, text="Filter:").pack(side="left")
+        self.filter_var = tk.StringVar(value=self.current_filter.name if self.current_filter else NO_FILTER)
+        self.filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_var,
+                                         state="readonly", width=40)
+        self.filter_combo.pack(side="left", padx=5)
+        self.refresh_filter_choices()
+
+        apply_button = ttk.Button(filter_frame, text="Apply Filter",
+                                  command=self.apply_selected_filter)
+        apply_button.pack(side="left", padx=5)
+        edit_button = ttk.Button(filter_frame, text="Edit Filters",
+                                 command=self.open_filter_window)
+        edit_button.pack(side="left", padx=5)
+
+        self.filter_status = ttk.Label(filter_frame, text="", font=('Helvetica', 9, 'italic'))
+        self.filter_status.pack(side="left", padx=10)
+
+        if self.skipped_listings:
+            for widget in (self.filter_combo, apply_button, edit_button):
+                widget.config(state="disabled")
+            self.filter_status.config(
+                text=f"{self.skipped_listings} listings skipped by the active filter; "
+                     f"search again without skipping them to re-filter or count saved filters"
+            )
+
+    def refresh_filter_choices(self):
+        self.filter_manager.filters = self.filter_manager.load_filters()
+        names = list(self.filter_manager.filters)
+        if self.current_filter and self.current_filter.name not in names:
+            names.insert(0, self.current_filter.name)
+        self.filter_combo['values'] = [NO_FILTER] + names
+
+    def open_filter_window(self):
+        from filter_window import FilterWindow
+
+        def on_filter_selected(filter_obj):
+            self.refresh_filter_choices()
+            self.filter_var.set(filter_obj.name)
+            self.apply_filter(filter_obj)
+
+        FilterWindow(self.window, on_filter_selected)
+
+    def apply_selected_filter(self):
+        name = self.filter_var.get()
+        if name == NO_FILTER:
+            self.apply_filter(None)
+        elif self.current_filter and name == self.current_filter.name and \
+                name not in self.filter_manager.filters:
+            self.apply_filter(self.current_filter)
+        else:
+            self.apply_filter(self.filter_manager.filters.get(name))
+
+    def apply_filter(self, filter_obj):
+        """Recompute the filtered results from the opportunities already fetched"""
+        if self.skipped_listings:
+            return
+        if self.opportunity_index is None:
+            self.opportunity_index = OpportunityIndex(self.all_results)
+        self.current_filter = filter_obj
+        self.filtered_results = self.opportunity_index.query(filter_obj)
+        self.new_count = sum(1 for opp in self.filtered_results if opp.get('is_new'))
+
+        tab = self.filtered_tab
+        tab['tree'].delete(*tab['tree'].get_children())
+        tab['results'] = self.filtered_results
+        tab['rendered'] = 0
+        self.schedule_render()
+
+        if self.facets_tree is not None:
+            self.facet_counts = FacetIndex(self.filtered_results).counts()
+            self.populate_facets()
+
+        if self.ranked_tree is not None:
+            terms = query_terms(self.search_keywords, filter_obj.keywords if filter_obj else None)
+            self.ranked_results = rank(self.filtered_results, terms)
+            self.populate_ranked()
+
+        self.filter_status.config(
+            text=f"{len(self.filtered_results)} of {len(self.all_results)} match"
+                 f" '{filter_obj.name}'" if filter_obj else "No filter applied"
+        )
+
+    def summary_text(self):
+        summary_text = (f"Found {len(self.filtered_results)} matching opportunities "
+                        f"out of {len(self.all_results)} total opportunities")
+        if self.new_count:
+            summary_text += f" ({self.new_count} new since the last run)"
+        if self.skipped_listings:
+            summary_text += f"; {self.skipped_listings} more listings were ruled out by the filter without being fetched"
+        return summary_text
+
+    def schedule_render(self):
+        if not self.render_scheduled:
+            self.render_scheduled = True
+            self.window.after(1, self.render_chunk)
+
+    def render_chunk(self):
+        """Add the next chunk of rows to each results list"""
+        self.render_scheduled = False
+        more = False
+        for tab in self.tabs:
+            results, tree, start = tab['results'], tab['tree'], tab['rendered']
+            end = min(start + RENDER_CHUNK_SIZE, len(results))
+            for index in range(start, end):
+                opp = results[index]
+                tree.insert("", tk.END, iid=str(index), text=opp.get('title', 'N/A'), values=(
+                    opp.get('agency', 'N/A'), opp.get('close_date', 'N/A'),
+                    "Yes" if opp.get('is_new') else ""
+                ))
+            tab['rendered'] = end
+            if tab['summary'] is not None:
+                tab['summary'].config(text=self.summary_text())
+            more = more or end < len(results)
+        if more:
+            self.schedule_render()
+
+    def show_details(self, tab, text_widget):
+        selection = tab['tree'].selection()
+        if not selection:
+            return
+        opp = tab['results'][int(selection[0])]
+        if self.format_opportunity:
+            details = self.format_opportunity(opp)
+        else:
+            details = "\n".join(f"{key}: {value}" for key, value in export_record(opp).items())
+        text_widget.configure(state='normal')
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert("1.0", details.strip("\n"))
+        text_widget.configure(state='disabled')
+
+    def setup_filter_counts_tab(self, parent):
+        """Setup a tab listing how many results each saved filter matches"""
+        ttk.Label(
+            parent,
+            text="Matches for each saved filter",
+            font=('Helvetica', 10, 'bold')
+        ).pack(anchor='w', padx=10, pady=(5, 10))
+
+        tree = ttk.Treeview(parent, columns=("count",), show="tree headings")
+        tree.heading("#0", text="Filter")
+        tree.heading("count", text="Matching Opportunities")
+        tree.column("count", anchor="center", width=180)
+        tree.pack(fill="both", expand=True, padx=10)
+
+        for name, count in self.filter_counts.items():
+            tree.insert("", tk.END, text=name, values=(count,))
+
+    def setup_ranked_tab(self, parent):
+        """Setup a tab listing the best-scoring results, most relevant first"""
+        self.ranked_label = ttk.Label(parent, text="", font=('Helvetica', 10, 'bold'))
+        self.ranked_label.pack(anchor='w', padx=10, pady=(5, 10))
+
+        columns = ("score", "agency", "close_date")
+        tree = ttk.Treeview(parent, columns=columns, show="tree headings")
+        tree.heading("#0", text="Opportunity Title")
+        tree.heading("score", text="Score")
+        tree.heading("agency", text="Agency")
+        tree.heading("close_date", text="Close Date")
+        tree.column("#0", width=450)
+        tree.column("score", anchor="center", width=70)
+        tree.column("agency", width=250)
+        tree.column("close_date", anchor="center", width=110)
+
+        scrollbar = ttk.Scrollbar(parent, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True, padx=10)
+
+        self.ranked_tree = tree
+        self.populate_ranked()
+
+    def populate_ranked(self):
+        tree = self.ranked_tree
+        tree.delete(*tree.get_children())
+        if self.ranked_results:
+            self.ranked_label.config(text=f"Top {len(self.ranked_results)} results by relevance")
+        else:
+            self.ranked_label.config(text="No search or filter keywords to rank by")
+        for score, opp in self.ranked_results:
+            tree.insert("", tk.END, text=opp.get('title', 'N/A'), values=(
+                f"{score:.2f}", opp.get('agency', 'N/A'), opp.get('close_date', 'N/A')
+            ))
+
+    def setup_facets_tab(self, parent):
+        """Setup a tab counting the filtered results by agency, eligibility and CFDA number"""
+        ttk.Label(
+            parent,
+            text="Matching opportunities by facet",
+            font=('Helvetica', 10, 'bold')
+        ).pack(anchor='w', padx=10, pady=(5, 10))
+
+        tree = ttk.Treeview(parent, columns=("count",), show="tree headings")
+        tree.heading("#0", text="Value")
+        tree.heading("count", text="Matching Opportunities")
+        tree.column("#0", width=700)
+        tree.column("count", anchor="center", width=180)
+
+        scrollbar = ttk.Scrollbar(parent, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True, padx=10)
+
+        self.facets_tree = tree
+        self.populate_facets()
+
+    def populate_facets(self):
+        tree = self.facets_tree
+        tree.delete(*tree.get_children())
+        for facet, counts in self.facet_counts.items():
+            if not counts:
+                continue
+            parent_item = tree.insert("", tk.END, text=FACET_LABELS.get(facet, facet),
+                                      values=(len(counts),), open=True)
+            for value, count in counts.items():
+                tree.insert(parent_item, tk.END, text=value, values=(count,))
 
     def setup_debug_tab(self, parent):
         """Setup the debug tab"""
@@ -125,6 +415,11 @@ class ResultsWindow:
         # Make text widget read-only
         text_widget.configure(state='disabled')
 
+    def handle_save_results(self):
+        """Save the results as currently filtered"""
+        if self.on_save_results:
+            self.on_save_results(self.filtered_results, self.all_results)
+
     def handle_new_search(self):
         self.window.destroy()
         if self.on_new_search:
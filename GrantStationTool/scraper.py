@@ -7,180 +7,177 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from results_window import ResultsWindow
-from filter_manager import FilterManager, SearchFilter 
-from datetime import datetime, timedelta
-import textwrap
+from filter_manager import FilterManager
+from http_fetcher import HttpFetcher, SessionExpiredError
+from page_parser import parse_listing_page, parse_detailed_info
+from driver_pool import DriverPool
+from opportunity_cache import OpportunityCache
+from seen_index import SeenIndex
+from filter_engine import compile_filter
+from opportunity import Opportunity
+from text_index import TextIndex
+from ranking import query_terms, rank
+from facet_index import FacetIndex
+from query_planner import search_keyword
+from exporters import open_exporter
+from formatting import format_opportunity
+from config import BASE_URL, USER_AGENT, COOKIES_FILE, HTTP_POOL_SIZE, WAIT_TIMEOUTS
+from config import MAX_LISTING_PAGES, MAX_RESULTS, TOP_K_RESULTS, SAVE_RESULTS_FORMAT
+from selenium.common.exceptions import TimeoutException
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import threading
+import atexit
 import requests
 import json
 import time
 import re
 
+def page_loaded(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+# A listing is ready once it shows result rows or the "no results" message
+LISTING_READY = EC.any_of(
+    EC.presence_of_element_located((By.CSS_SELECTOR, "td.views-field-title a")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "div.view-empty"))
+)
+
+DETAIL_READY = EC.any_of(
+    EC.presence_of_element_located((By.CSS_SELECTOR, "div.field--name-field-description")),
+    EC.presence_of_element_located((By.CSS_SELECTOR, "h1.page-header"))
+)
+
 class GrantStationScraper:
-    def __init__(self, username, password):
+    ENGINES = ("selenium", "http")
+
+    def __init__(self, username, password, engine="selenium", max_workers=1,
+                 max_pages=MAX_LISTING_PAGES, max_results=MAX_RESULTS):
         self.username = username
         self.password = password
+        self.engine = engine
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.max_results = max_results
+        self.fetcher = None
+        self.cache = None
+        self.force_refresh = False
+        self.seen_index = None
+        self.text_index = None
+        self.incremental = False
+        self.refetch_changed = False
+        self.listing_filter = None
+        self.skipped_listings = 0
+        # Detail URL -> search keywords whose listings contained it
+        self.link_keywords = {}
+        # Set from any thread to stop a running search
+        self.cancel_event = threading.Event()
+        self.on_progress = None
+        self.progress = {}
+        self.progress_started = None
+        self.debug_lock = threading.Lock()
         self.chrome_options = Options()
         self.chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         self.chrome_options.add_argument("--headless=new")
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
+        self.chrome_options.add_argument("--no-sandbox")
+        self.chrome_options.add_argument("--disable-dev-shm-usage")
+        self.driver_path = None
+        self.driver_pool = None
+        self.session_cookies = None
         self.driver = None
         self.wait = None
-        self.results_text = ""
+        self.wait_timings = defaultdict(list)
+        self.last_results = None
         self.debug_mode = False
-        self.debug_text = ""
+        # Debug output is collected as parts and joined on demand
+        self.debug_parts = []
         self.filter_manager = FilterManager()
         self.current_filter = None
+        atexit.register(self.close)
 
     def apply_filter_to_results(self, opportunities, filter_obj):
         """Apply filter to search results"""
         if not filter_obj:
             return opportunities
 
+        compiled_filter = compile_filter(filter_obj)
+        if self.debug_mode and compiled_filter is not filter_obj:
+            for error in compiled_filter.errors:
+                self.add_debug(f"\nDEBUG: Date parsing error: {error}\n")
+
         filtered_results = []
         for opp in opportunities:
-            matches = True
-            
-            # Check keywords in title and description
-            if filter_obj.keywords:
-                text_to_search = (
-                    f"{opp.get('title', '')} {opp.get('description', '')}".lower()
-                )
-                if not all(kw.lower() in text_to_search for kw in filter_obj.keywords):
-                    if self.debug_mode:
-                        self.debug_text += f"\nDEBUG: {opp.get('title', 'Unknown')} failed keyword match\n"
-                    matches = False
-
-            # Check date ranges
-            if matches and filter_obj.start_date and opp.get('post_date'):
-                try:
-                    # Try multiple date formats
-                    post_date = None
-                    date_formats = ["%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y"]
-                    for date_format in date_formats:
-                        try:
-                            post_date = datetime.strptime(opp['post_date'], date_format)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if post_date and filter_obj.start_date:
-                        filter_start = datetime.strptime(filter_obj.start_date, "%Y-%m-%d")
-                        if post_date < filter_start:
-                            if self.debug_mode:
-                                self.debug_text += f"\nDEBUG: {opp.get('title', 'Unknown')} failed start date check\n"
-                            matches = False
-                except Exception as e:
-                    if self.debug_mode:
-                        self.debug_text += f"\nDEBUG: Date parsing error: {str(e)}\n"
-
-            if matches and filter_obj.end_date and opp.get('close_date'):
-                try:
-                    # Try multiple date formats
-                    close_date = None
-                    date_formats = ["%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y"]
-                    for date_format in date_formats:
-                        try:
-                            close_date = datetime.strptime(opp['close_date'], date_format)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if close_date and filter_obj.end_date:
-                        filter_end = datetime.strptime(filter_obj.end_date, "%Y-%m-%d")
-                        if close_date > filter_end:
-                            if self.debug_mode:
-                                self.debug_text += f"\nDEBUG: {opp.get('title', 'Unknown')} failed end date check\n"
-                            matches = False
-                except Exception as e:
-                    if self.debug_mode:
-                        self.debug_text += f"\nDEBUG: Date parsing error: {str(e)}\n"
-
-            # Check amount range if specified
-            if matches and (filter_obj.min_amount is not None or filter_obj.max_amount is not None):
-                amount = self.extract_amount_from_opportunity(opp)
-                if amount is not None:
-                    if filter_obj.min_amount and amount < filter_obj.min_amount:
-                        if self.debug_mode:
-                            self.debug_text += f"\nDEBUG: {opp.get('title', 'Unknown')} failed minimum amount check\n"
-                        matches = False
-                    if filter_obj.max_amount and amount > filter_obj.max_amount:
-                        if self.debug_mode:
-                            self.debug_text += f"\nDEBUG: {opp.get('title', 'Unknown')} failed maximum amount check\n"
-                        matches = False
-
-            if matches:
+            failed_check = compiled_filter.explain(opp)
+            if failed_check is None:
                 filtered_results.append(opp)
+            elif self.debug_mode:
+                self.add_debug(f"\nDEBUG: {opp.get('title', 'Unknown')} failed {failed_check}\n")
 
         return filtered_results
 
-    def extract_amount_from_opportunity(self, opp):
-        """Try to extract funding amount from opportunity details"""
-        import re
+    def create_driver(self):
+        """Start a new headless Chrome instance"""
+        # Only resolve the Chrome driver once per session
+        if self.driver_path is None:
+            self.driver_path = ChromeDriverManager().install()
+            print(f"Driver path: {self.driver_path}")
         
-        # Common patterns for money amounts in text
-        patterns = [
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:million|M)',  # Matches $X million or $XM
-            r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # Matches standard currency format
-        ]
+        service = Service(self.driver_path)
         
-        text_to_search = f"{opp.get('title', '')} {opp.get('description', '')}"
+        # Create the driver with error handling
+        try:
+            driver = webdriver.Chrome(service=service, options=self.chrome_options)
+        except Exception as e:
+            print(f"Error creating Chrome driver: {str(e)}")
+            # Try alternative initialization
+            driver = webdriver.Chrome(options=self.chrome_options)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text_to_search)
-            if matches:
-                try:
-                    # Take the first match and convert to float
-                    amount_str = matches[0].replace(',', '')
-                    amount = float(amount_str)
-                    
-                    # If it's in millions, multiply accordingly
-                    if 'million' in text_to_search.lower() or 'M' in text_to_search:
-                        amount *= 1_000_000
-                        
-                    return amount
-                except (ValueError, IndexError):
-                    continue
-                    
-        return None
+        # Add undetected-chromedriver properties
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            "userAgent": USER_AGENT
+        })
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
+
+    def create_logged_in_driver(self):
+        """Driver pool factory: start Chrome and give it a logged-in session"""
+        if self.session_cookies:
+            print("Starting additional Chrome driver...")
+            driver = self.create_driver()
+            driver.get(BASE_URL)
+            for cookie in self.session_cookies:
+                driver.add_cookie(cookie)
+            return driver
+
+        # The first driver goes through the full cookie check
+        self.initialize_driver()
+        
+        if self.load_cookies():
+            print("Attempting to use saved cookies...")
+            self.driver.get("https://grantstation.com")
+            self.wait_for(self.driver, "homepage", page_loaded)
+            
+            if "user/login" in self.driver.current_url.lower():
+                print("Saved cookies expired, logging in again...")
+                self.driver.quit()
+                self.initialize_driver()
+            else:
+                print("Successfully logged in with saved cookies")
+
+        # Further pool drivers reuse this session instead of repeating the login
+        self.session_cookies = self.driver.get_cookies()
+        return self.driver
 
     def initialize_driver(self):
         print("Initializing Chrome driver...")
         try:
-            # Updated driver initialization with explicit version
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            # Get the latest stable Chrome driver
-            driver_path = ChromeDriverManager().install()
-            print(f"Driver path: {driver_path}")
-            
-            service = Service(driver_path)
-            
-            # Add additional Chrome options
-            self.chrome_options.add_argument("--no-sandbox")
-            self.chrome_options.add_argument("--disable-dev-shm-usage")
-            
-            # Create the driver with error handling
-            try:
-                self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
-            except Exception as e:
-                print(f"Error creating Chrome driver: {str(e)}")
-                # Try alternative initialization
-                self.driver = webdriver.Chrome(options=self.chrome_options)
-            
-            # Add undetected-chromedriver properties
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+            self.driver = self.create_driver()
             self.wait = WebDriverWait(self.driver, 20)
             
             print("Visiting homepage...")
             self.driver.get("https://grantstation.com")
-            time.sleep(3)
+            self.wait_for(self.driver, "homepage", page_loaded)
             
             print("Accessing login page...")
             self.driver.get("https://grantstation.com/user/login")
@@ -191,10 +188,39 @@ class GrantStationScraper:
             print(f"Failed to initialize driver: {str(e)}")
             raise
         
-    def type_with_delay(self, element, text):
-        for character in text:
-            element.send_keys(character)
-            time.sleep(0.1)
+    def wait_for(self, driver, phase, condition):
+        """Wait until the page satisfies condition, up to the phase's timeout.
+
+        Returns False on timeout so callers can carry on with whatever has loaded.
+        """
+        timeout = WAIT_TIMEOUTS.get(phase, WAIT_TIMEOUTS['default'])
+        start = time.perf_counter()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+            ready = True
+        except TimeoutException:
+            print(f"Timed out after {timeout}s waiting for {phase} page")
+            ready = False
+        elapsed = time.perf_counter() - start
+
+        with self.debug_lock:
+            self.wait_timings[phase].append((elapsed, ready))
+        return ready
+
+    def wait_summary(self):
+        """Summarize recorded wait durations per phase"""
+        lines = []
+        with self.debug_lock:
+            for phase, timings in self.wait_timings.items():
+                durations = [elapsed for elapsed, ready in timings]
+                timeouts = sum(1 for elapsed, ready in timings if not ready)
+                lines.append(
+                    f"{phase}: {len(durations)} waits, "
+                    f"avg {sum(durations) / len(durations):.2f}s, "
+                    f"max {max(durations):.2f}s, "
+                    f"{timeouts} timeouts"
+                )
+        return "\n".join(lines)
 
     def attempt_alternative_login(self):
         try:
@@ -234,156 +260,442 @@ class GrantStationScraper:
                         })
                     
                     self.driver.refresh()
-                    time.sleep(3)
+                    self.wait_for(self.driver, "cookie_refresh", page_loaded)
             
         except Exception as e:
             print(f"Alternative login failed: {str(e)}")
 
-    def extract_opportunity_links(self, main_page_source):
-        links = []
-        try:
-            title_elements = self.driver.find_elements(By.CSS_SELECTOR, "td.views-field-title a")
-            for element in title_elements:
-                href = element.get_attribute('href')
-                title = element.text.strip()
-                if href:
-                    links.append({'url': href, 'title': title})
-            return links
-        except Exception as e:
-            print(f"Error extracting opportunity links: {str(e)}")
-            return []
+    def prepare_http_session(self):
+        """Set up the browserless engine, only starting Chrome if the saved cookies no longer work"""
+        self.fetcher = HttpFetcher(pool_size=max(HTTP_POOL_SIZE, self.max_workers))
+        if self.fetcher.load_cookies_from_file() and self.fetcher.is_logged_in():
+            print("Successfully logged in with saved cookies")
+            return
 
-    def extract_detailed_info(self, url):
+        print("Saved cookies expired, logging in with Chrome...")
+        self.initialize_driver()
         try:
-            print(f"Accessing detailed page: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-
-            title = (
-                self.safe_get_text_by_selector("h1.page-header") or 
-                self.safe_get_text_by_selector("meta[property='og:title']", attribute='content') or
-                self.safe_get_text_by_selector("div.views-field-title") or
-                "Title Not Found"
-            )
-
-            if self.debug_mode:
-                self.debug_text += f"\nDEBUG: Extracting from URL: {url}\n"
-                self.debug_text += f"DEBUG: Raw title found: {title}\n"
-
-            detailed_info = {
-                'title': title,
-                'description': self.safe_get_text_by_selector("div.field--name-field-description"),
-                'agency': self.safe_get_text_by_selector("div.field--name-field-agency-name"),
-                'opportunity_number': self.safe_get_text_by_selector("div.field--name-field-funding-opportunity-number"),
-                'post_date': self.safe_get_text_by_selector("div.field--name-field-post-date"),
-                'close_date': self.safe_get_text_by_selector("div.field--name-field-close-date"),
-                'eligible_applicants': self.get_eligible_applicants(),
-                'additional_eligibility': self.safe_get_text_by_selector("div#add-elig-in-profile"),
-                'cfda_numbers': self.get_cfda_numbers(),
-                'additional_info_url': self.safe_get_link_by_selector("div.field--name-field-additional-information a")
-            }
-
-            # Add grants.gov link if present
-            grants_gov_link = self.safe_get_link_by_selector("div.visit-website-link a")
-            if grants_gov_link:
-                detailed_info['grants_gov_url'] = grants_gov_link
-
-            if self.debug_mode:
-                self.debug_text += "DEBUG: Extracted fields:\n"
-                for key, value in detailed_info.items():
-                    self.debug_text += f"DEBUG: {key}: {value}\n"
+            self.attempt_alternative_login()
+            cookies = self.driver.get_cookies()
+            self.fetcher.load_cookies(cookies)
+        finally:
+            # Chrome is only needed for login
+            self.driver.quit()
+            self.driver = None
+
+        # Don't overwrite the saved cookies with a failed login, or search on
+        # with a session every page request would reject
+        if not self.fetcher.is_logged_in():
+            raise SessionExpiredError("Login failed, check the GrantStation username and password")
+        self.save_cookies(cookies)
+
+    def iter_opportunity_links(self, url, max_pages=None, max_results=None, seen_links=None):
+        """Yield opportunity links page by page, following the listing's pager.
+
+        Stops after max_pages listing pages or max_results links, or as soon as the
+        consumer stops iterating. Pass a shared seen_links set to merge several
+        searches without repeating links.
+        """
+        max_pages = max_pages or self.max_pages
+        max_results = max_results or self.max_results
+        seen_pages = set()
+        seen_links = set() if seen_links is None else seen_links
+        if max_results and len(seen_links) >= max_results:
+            return
+        keyword = search_keyword(url)
+        page_url = url
+        page_number = 0
+
+        while page_url and page_url not in seen_pages:
+            if self.cancel_event.is_set():
+                return
+            if max_pages and page_number >= max_pages:
+                print(f"Stopping after {max_pages} listing pages")
+                return
+            seen_pages.add(page_url)
+            page_number += 1
 
+            try:
+                links, page_url = self.get_listing_page(page_url)
+            except Exception as e:
+                print(f"Error loading listing page {page_number}: {str(e)}")
+                return
+
+            for link in links:
+                if keyword:
+                    keywords = self.link_keywords.setdefault(link['url'], [])
+                    if keyword not in keywords:
+                        keywords.append(keyword)
+                if link['url'] in seen_links:
+                    continue
+                seen_links.add(link['url'])
+                self.update_progress(links=1)
+                yield link
+                if self.cancel_event.is_set():
+                    return
+                if max_results and len(seen_links) >= max_results:
+                    print(f"Stopping after {max_results} results")
+                    return
+
+    def extract_detailed_info_http(self, url):
+        try:
+            print(f"Fetching detailed page: {url}")
+            detailed_info = parse_detailed_info(self.fetcher.get_html(url), url)
+            self.debug_extracted(url, detailed_info)
             return detailed_info
 
         except Exception as e:
             error_msg = f"Error extracting detailed info: {str(e)}"
             print(error_msg)
             if self.debug_mode:
-                self.debug_text += f"DEBUG ERROR: {error_msg}\n"
+                self.add_debug(f"DEBUG ERROR: {error_msg}\n")
             return None
 
-    def safe_get_text_by_selector(self, selector, attribute=None):
+    def debug_extracted(self, url, detailed_info):
+        if self.debug_mode:
+            debug_lines = [f"\nDEBUG: Extracting from URL: {url}\n", "DEBUG: Extracted fields:\n"]
+            debug_lines.extend(f"DEBUG: {key}: {value}\n" for key, value in detailed_info.items())
+            self.add_debug("".join(debug_lines))
+
+    @property
+    def debug_text(self):
+        return "".join(self.debug_parts)
+
+    def add_debug(self, text):
+        """Append to the debug log; safe to call from worker threads"""
+        with self.debug_lock:
+            self.debug_parts.append(text)
+
+    def iter_details(self, opportunity_links):
+        """Yield (link, detailed_info) pairs in listing order as detail pages are extracted.
+
+        Links are consumed lazily, so detail pages from the first listing page are
+        fetched while later listing pages are still loading. A failed page yields
+        None for that link so the rest of the batch still completes.
+        """
+        def extract(url):
+            if self.cancel_event.is_set():
+                return None
+            try:
+                if self.engine == "http":
+                    return self.store_in_cache(url, self.extract_detailed_info(url))
+                with self.driver_pool.driver() as driver:
+                    return self.store_in_cache(url, self.extract_detailed_info(url, driver))
+            except Exception as e:
+                print(f"Error processing opportunity {url}: {str(e)}")
+                return None
+
+        if self.max_workers <= 1:
+            for link in opportunity_links:
+                cached = self.cached_info_for_link(link)
+                if cached:
+                    yield link, cached
+                    continue
+                try:
+                    yield link, self.store_in_cache(link['url'], self.extract_detailed_info(link['url']))
+                except Exception as e:
+                    print(f"Error processing opportunity {link['url']}: {str(e)}")
+                    yield link, None
+            return
+
+        print(f"Extracting opportunities with {self.max_workers} workers...")
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = deque()
         try:
-            element = self.driver.find_element(By.CSS_SELECTOR, selector)
-            if attribute:
-                return element.get_attribute(attribute)
-            return element.text.strip()
-        except Exception as e:
-            if self.debug_mode:
-                self.debug_text += f"DEBUG: Failed to get text for selector '{selector}': {str(e)}\n"
-            return "N/A"
+            for link in opportunity_links:
+                cached = self.cached_info_for_link(link)
+                if cached:
+                    future = Future()
+                    future.set_result(cached)
+                else:
+                    future = executor.submit(extract, link['url'])
+                pending.append((link, future))
+                # Hand back finished pages without waiting for the rest of the listing
+                while pending and pending[0][1].done():
+                    link, future = pending.popleft()
+                    yield link, future.result()
+
+            while pending and not self.cancel_event.is_set():
+                link, future = pending.popleft()
+                yield link, future.result()
+        finally:
+            # Queued pages are dropped; pages already loading finish first
+            executor.shutdown(wait=True, cancel_futures=True)
 
-    def safe_get_link_by_selector(self, selector):
+    def cached_info_for_link(self, link):
+        """Cached details for a listing link, unless the link is marked for refresh"""
+        if link.get('refresh'):
+            return None
+        if link.get('cache_only'):
+            # An unchanged listing's stored details are still current however old,
+            # and are used even with force_refresh
+            cached = self.get_cached_info(link['url'], ignore_ttl=True)
+            if cached is None:
+                print(f"No cached details for {link['url']}, fetching it again")
+            return cached
+        return self.get_cached_info(link['url'])
+
+    def get_cached_info(self, url, ignore_ttl=False):
+        """Return fresh cached details for url unless a refresh was forced.
+
+        With ignore_ttl, stale entries are returned and force_refresh is ignored.
+        """
+        if self.cache is None or (self.force_refresh and not ignore_ttl):
+            return None
         try:
-            element = self.driver.find_element(By.CSS_SELECTOR, selector)
-            return element.get_attribute('href')
-        except:
+            cached = self.cache.get(url, ignore_ttl=ignore_ttl)
+        except Exception as e:
+            print(f"Error reading cache: {str(e)}")
             return None
+        if cached and self.debug_mode:
+            self.add_debug(f"\nDEBUG: Using cached details for {url}\n")
+        return cached
+
+    def store_in_cache(self, url, detailed_info):
+        if detailed_info and self.cache is not None:
+            try:
+                self.cache.put(url, detailed_info)
+            except Exception as e:
+                print(f"Error writing cache: {str(e)}")
+        if detailed_info and self.text_index is not None:
+            try:
+                self.text_index.add(url, detailed_info)
+            except Exception as e:
+                print(f"Error updating search index: {str(e)}")
+        return detailed_info
 
-    def get_eligible_applicants(self):
+    def extract_detailed_info(self, url, driver=None):
+        if self.engine == "http":
+            return self.extract_detailed_info_http(url)
+
+        driver = driver or self.driver
         try:
-            elements = self.driver.find_elements(By.CSS_SELECTOR, "div#elig-app-in-profile .field__item")
-            return [elem.text.strip() for elem in elements]
-        except:
-            return []
+            print(f"Accessing detailed page: {url}")
+            self.load_page(driver, url)
+            self.wait_for(driver, "detail", DETAIL_READY)
 
-    def get_cfda_numbers(self):
+            # Read the rendered page once and parse it locally, rather than
+            # querying the driver separately for every field
+            detailed_info = parse_detailed_info(driver.page_source, url)
+            self.debug_extracted(url, detailed_info)
+            return detailed_info
+
+        except Exception as e:
+            error_msg = f"Error extracting detailed info: {str(e)}"
+            print(error_msg)
+            if self.debug_mode:
+                self.add_debug(f"DEBUG ERROR: {error_msg}\n")
+            return None
+
+    def load_page(self, driver, url):
+        """Navigate a driver and count the page towards its recycling limit"""
+        driver.get(url)
+        if self.driver_pool:
+            self.driver_pool.record_page(driver)
+
+    def release_driver(self):
+        """Hand the current driver back to the pool so it stays warm for the next search"""
+        if self.driver:
+            if self.driver_pool:
+                self.driver_pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+
+    def close(self):
+        """Shut down every Chrome instance and HTTP session"""
+        self.release_driver()
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+        if self.fetcher:
+            self.fetcher.close()
+            self.fetcher = None
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+        if self.seen_index:
+            self.seen_index.close()
+            self.seen_index = None
+        if self.text_index:
+            self.text_index.close()
+            self.text_index = None
+
+    def search_cached(self, search_filter=None, keyword=None):
+        """Search every opportunity fetched so far without going online.
+
+        keyword is looked up in the local text index and only the opportunities
+        it matched are loaded, then search_filter is applied to them.
+        """
+        text_index = self.text_index or TextIndex()
         try:
-            elements = self.driver.find_elements(By.CSS_SELECTOR, "div#cfda-numbers-in-profile .field__item")
-            return [elem.text.strip() for elem in elements]
-        except:
-            return []
+            if not text_index.document_count():
+                # Index whatever an older version of the tool left in the cache
+                cache = self.cache or OpportunityCache()
+                try:
+                    text_index.add_many((opp['url'], opp) for opp in cache.load_all())
+                finally:
+                    if cache is not self.cache:
+                        cache.close()
+
+            if keyword and keyword.strip():
+                documents = text_index.search_documents(keyword)
+            else:
+                documents = text_index.load_all()
+            opportunities = [Opportunity.from_dict(document) for document in documents]
+            compiled_filter = compile_filter(search_filter)
+            if compiled_filter is None:
+                return opportunities
+            return [opp for opp in opportunities if compiled_filter(opp)]
+        finally:
+            if text_index is not self.text_index:
+                text_index.close()
+
+    def iter_cached_results(self, url, seen_links=None):
+        """Yield the already fetched opportunities matching a search URL's keyword,
+        without logging in or loading any page"""
+        keyword = search_keyword(url)
+        seen_links = set() if seen_links is None else seen_links
+        for opportunity in self.search_cached(keyword=keyword):
+            if keyword:
+                keywords = self.link_keywords.setdefault(opportunity.url, [])
+                if keyword not in keywords:
+                    keywords.append(keyword)
+            if opportunity.url in seen_links:
+                continue
+            if self.max_results and len(seen_links) >= self.max_results:
+                print(f"Stopping after {self.max_results} results")
+                return
+            seen_links.add(opportunity.url)
+            opportunity.matched_keywords = self.link_keywords.setdefault(opportunity.url, [])
+            self.update_progress(links=1, fetched=1)
+            yield opportunity
+            if self.cancel_event.is_set():
+                return
 
     def start_new_search(self, current_window):
         """Close current results and start new search"""
         current_window.destroy()
-        self.results_text = ""
-        if self.driver:
-            self.driver.quit()
+        self.release_driver()
         from main import start_new_search  # Import here to avoid circular import
-        start_new_search()
-
-    def extract_grant_info(self, url):
+        start_new_search(self)
+
+    def get_listing_page(self, url):
+        """Load one search listing page and return its opportunity links and the next page URL"""
+        print(f"Accessing URL: {url}")
+        if self.engine == "http":
+            return parse_listing_page(self.fetcher.get_html(url))
+
+        self.load_page(self.driver, url)
+        self.wait_for(self.driver, "listing", LISTING_READY)
+        return parse_listing_page(self.driver.page_source)
+
+    def iter_grant_info(self, url, seen_links=None, opportunity_links=None):
+        """Yield an Opportunity for a search URL as each detail page is extracted.
+        opportunity_links, if given, are the URL's listing links crawled beforehand"""
+        if opportunity_links is None:
+            opportunity_links = self.iter_opportunity_links(url, seen_links=seen_links)
+        opportunity_links = self.classify_links(self.prefilter_links(opportunity_links))
+        for link, detailed_info in self.iter_details(opportunity_links):
+            self.update_progress(fetched=1)
+            if detailed_info:
+                opportunity = Opportunity.from_dict(detailed_info, url=link['url'])
+                # Shared with link_keywords, so keywords from later searches show up too
+                opportunity.matched_keywords = self.link_keywords.setdefault(link['url'], [])
+                yield self.mark_seen(link, opportunity)
+
+    def cancel(self):
+        """Stop the running search; it returns what was extracted so far"""
+        self.cancel_event.set()
+
+    def update_progress(self, **increments):
+        """Add to the progress counters and report them to on_progress, with an ETA
+        for the links found so far based on the detail pages done so far"""
+        for name, increment in increments.items():
+            self.progress[name] = self.progress.get(name, 0) + increment
+        if not self.on_progress:
+            return
+        progress = dict(self.progress)
+        progress['skipped'] = self.skipped_listings
+        fetched = progress.get('fetched', 0)
+        remaining = progress.get('links', 0) - progress['skipped'] - fetched
+        elapsed = time.time() - self.progress_started
+        progress['eta'] = remaining * elapsed / fetched if fetched and remaining > 0 else None
         try:
-            print(f"Accessing URL: {url}")
-            self.driver.get(url)
-            time.sleep(5)
-            
-            opportunity_links = self.extract_opportunity_links(self.driver.page_source)
-            
-            detailed_results = []
-            for link in opportunity_links:
-                try:
-                    detailed_info = self.extract_detailed_info(link['url'])
-                    if detailed_info:
-                        detailed_results.append(detailed_info)
-                        self.results_text += "\n" + "="*50 + "\n"
-                        self.results_text += f"Title: {detailed_info['title']}\n"
-                        self.results_text += f"Agency: {detailed_info['agency']}\n"
-                        self.results_text += f"Opportunity Number: {detailed_info['opportunity_number']}\n"
-                        self.results_text += f"Post Date: {detailed_info['post_date']}\n"
-                        self.results_text += f"Close Date: {detailed_info['close_date']}\n"
-                        self.results_text += f"Description: {detailed_info['description']}\n"
-                        self.results_text += "\nEligible Applicants:\n"
-                        for applicant in detailed_info['eligible_applicants']:
-                            self.results_text += f"- {applicant}\n"
-                        self.results_text += f"\nCFDA Numbers: {', '.join(detailed_info['cfda_numbers'])}\n"
-                        if detailed_info.get('grants_gov_url'):
-                            self.results_text += f"Grants.gov URL: {detailed_info['grants_gov_url']}\n"
-                        if detailed_info['additional_info_url']:
-                            self.results_text += f"Additional Information: {detailed_info['additional_info_url']}\n"
-                except Exception as e:
-                    print(f"Error processing opportunity {link['url']}: {str(e)}")
-                    
-            return detailed_results
-            
+            self.on_progress(progress)
         except Exception as e:
-            print(f"Error extracting data: {str(e)}")
-            return []
+            print(f"Error reporting progress: {str(e)}")
+
+    def prefilter_links(self, opportunity_links):
+        """Drop links whose listing row already fails the active filter, so their
+        detail pages are never loaded"""
+        for link in opportunity_links:
+            failed_check = self.listing_filter.explain_listing(link) if self.listing_filter else None
+            if failed_check:
+                self.skipped_listings += 1
+                if self.debug_mode:
+                    self.add_debug(
+                        f"\nDEBUG: Skipped '{link.get('title', 'N/A')}' from its listing row "
+                        f"(failed {failed_check})\n"
+                    )
+                continue
+            yield link
+
+    def classify_links(self, opportunity_links):
+        """Tag links as new, changed or unchanged against the seen index.
+
+        In incremental mode only new links (and changed ones, if enabled) are
+        fetched; unchanged links are served from the cache, whatever its age, and
+        only fetched again if their details are no longer cached.
+        """
+        for link in opportunity_links:
+            if not self.seen_index:
+                yield link
+                continue
+
+            link['status'] = self.seen_index.status(link['url'], link.get('row_hash'))
+            if self.incremental and link['status'] != SeenIndex.NEW:
+                if link['status'] == SeenIndex.CHANGED and self.refetch_changed:
+                    link['refresh'] = True
+                else:
+                    link['cache_only'] = True
+            yield link
+
+    def merge_duplicate(self, opportunity, by_number):
+        """Fold an opportunity into one already found under another URL with the
+        same opportunity number, returning True if it was a duplicate"""
+        number = opportunity.opportunity_number
+        if not number or number == "N/A":
+            return False
+        existing = by_number.get(number)
+        if existing is None:
+            # Only the URL and keyword list are kept, not the whole opportunity
+            by_number[number] = (opportunity.url, opportunity.matched_keywords)
+            return False
+        existing_url, existing_keywords = existing
+        for keyword in opportunity.matched_keywords:
+            if keyword not in existing_keywords:
+                existing_keywords.append(keyword)
+        self.link_keywords[opportunity.url] = existing_keywords
+        if self.debug_mode:
+            self.add_debug(f"\nDEBUG: {opportunity.url} duplicates {existing_url} ({number})\n")
+        return True
+
+    def mark_seen(self, link, opportunity):
+        """Record the opportunity in the seen index and flag it if this is its first sighting"""
+        if not self.seen_index:
+            return opportunity
+
+        opportunity.is_new = (
+            link.get('status') == SeenIndex.NEW and
+            not self.seen_index.is_known_number(opportunity.opportunity_number, link['url'])
+        )
+        self.seen_index.record(link['url'], opportunity.opportunity_number, link.get('row_hash'))
+        return opportunity
 
     def load_cookies(self):
         try:
-            with open('grantstation_cookies.json', 'r') as f:
+            with open(COOKIES_FILE, 'r') as f:
                 cookies = json.load(f)
                 self.driver.get("https://grantstation.com")
                 for cookie in cookies:
@@ -397,23 +709,30 @@ class GrantStationScraper:
             print(f"Error loading cookies: {str(e)}")
             return False
 
-    def save_cookies(self):
-        if self.driver:
+    def save_cookies(self, cookies=None):
+        if cookies is None and self.driver:
             cookies = self.driver.get_cookies()
-            with open('grantstation_cookies.json', 'w') as f:
+        if cookies is not None:
+            with open(COOKIES_FILE, 'w') as f:
                 json.dump(cookies, f)
             print("Cookies saved successfully")
 
-    def save_results(self):
-        """Save both filtered and all results to separate files"""
+    def save_results(self, filtered_results=None, all_results=None, format=SAVE_RESULTS_FORMAT):
+        """Save filtered and all results (by default the last search's) to separate files"""
+        if all_results is None:
+            if not self.last_results:
+                print("No results to save")
+                return
+            filtered_results = self.last_results['filtered_results']
+            all_results = self.last_results['all_results']
         try:
             # Save filtered results
-            with open("filtered_results.txt", "w", encoding='utf-8') as f:
-                f.write(self.filtered_results_text)
+            with open_exporter(f"filtered_results.{format}", format) as exporter:
+                exporter.write_all(filtered_results or [])
             
             # Save all results
-            with open("all_results.txt", "w", encoding='utf-8') as f:
-                f.write(self.all_results_text)
+            with open_exporter(f"all_results.{format}", format) as exporter:
+                exporter.write_all(all_results)
                 
             print("Results saved successfully!")
         except Exception as e:
@@ -421,110 +740,218 @@ class GrantStationScraper:
 
     def format_opportunity(self, opp):
         """Format a single opportunity in a readable way"""
-        formatted = "\n" + "="*80 + "\n"
-        formatted += f"Opportunity Title: {opp.get('title', 'N/A')}\n"
-        formatted += "-"*40 + "\n\n"
-        
-        # Main details
-        formatted += "OVERVIEW\n"
-        formatted += "-"*8 + "\n"
-        formatted += f"Agency: {opp.get('agency', 'N/A')}\n"
-        formatted += f"Opportunity Number: {opp.get('opportunity_number', 'N/A')}\n"
-        formatted += f"Post Date: {opp.get('post_date', 'N/A')}\n"
-        formatted += f"Close Date: {opp.get('close_date', 'N/A')}\n\n"
-        
-        # Description
-        formatted += "DESCRIPTION\n"
-        formatted += "-"*11 + "\n"
-        description = opp.get('description', 'No description available.')
-        # Wrap description text at 80 characters
-        wrapped_desc = '\n'.join(textwrap.wrap(description, width=80))
-        formatted += f"{wrapped_desc}\n\n"
-        
-        # Eligible Applicants
-        formatted += "ELIGIBLE APPLICANTS\n"
-        formatted += "-"*18 + "\n"
-        eligible = opp.get('eligible_applicants', [])
-        if eligible:
-            for applicant in eligible:
-                formatted += f"• {applicant}\n"
+        return format_opportunity(opp)
+
+    def login(self):
+        """Open a logged-in session for the active engine"""
+        if self.engine == "http":
+            self.prepare_http_session()
+            return
+
+        # One driver walks the listing while the others render detail pages
+        pool_size = self.max_workers + 1 if self.max_workers > 1 else 1
+        if self.driver_pool is None:
+            self.driver_pool = DriverPool(self.create_logged_in_driver, size=pool_size)
         else:
-            formatted += "No eligibility information available.\n"
-        formatted += "\n"
-        
-        # Additional Information
-        formatted += "ADDITIONAL INFORMATION\n"
-        formatted += "-"*21 + "\n"
-        if opp.get('cfda_numbers'):
-            formatted += f"CFDA Numbers: {', '.join(opp.get('cfda_numbers', []))}\n"
-        if opp.get('grants_gov_url'):
-            formatted += f"Grants.gov URL: {opp.get('grants_gov_url')}\n"
-        if opp.get('additional_info_url'):
-            formatted += f"Additional Information: {opp.get('additional_info_url')}\n"
-            
-        formatted += "\n" + "="*80 + "\n"
-        return formatted
-
-    def run(self, urls, debug_mode=False, search_filter=None):
-        """Updated run method with better formatting"""
+            self.driver_pool.resize(pool_size)
+
+        # Reuses a warm, logged-in Chrome from an earlier search when available
+        self.driver = self.driver_pool.acquire()
+        self.wait = WebDriverWait(self.driver, 20)
+
+    def search(self, urls, debug_mode=False, search_filter=None, engine=None, max_workers=None,
+               max_pages=None, max_results=None, force_refresh=False, incremental=False,
+               refetch_changed=False, top_k=TOP_K_RESULTS, pushdown=False, on_result=None,
+               collect=True, on_progress=None, offline=False):
+        """Scrape and filter the search URLs, returning the results without showing them.
+
+        The returned dict holds the all/filtered opportunities, the saved
+        filter counts, facet_counts for the filtered results
+        ({facet: {value: count}}), and ranked_results: the top_k filtered
+        opportunities as (score, opportunity) pairs, scored with BM25 against the
+        search keyword and the filter's keywords.
+
+        With pushdown (off by default), listings whose row already fails the
+        filter's date or agency checks are skipped without loading their detail
+        pages, so they are left out of all_results too; skipped_listings counts
+        them. The saved filter counts are then left empty, since they would miss
+        them. Streaming callers that only want the filtered results (collect=False)
+        lose nothing by turning it on.
+
+        With offline, nothing is loaded from the site: each URL's keyword is
+        answered from the local text index of opportunities fetched before.
+
+        on_result, if given, is called with each opportunity that passes the
+        filter (every opportunity without one) as soon as it is extracted.
+        With collect=False the results are only passed to on_result (e.g. an
+        exporter) and not kept, so memory stays flat however long the crawl.
+        With several URLs their listings are then all crawled first, so each
+        streamed opportunity's matched_keywords names every URL that found it.
+
+        on_progress is called with a dict of counters (links, fetched, skipped,
+        matches) and an eta in seconds as the search advances. Both callbacks run
+        on the searching thread. cancel() stops the search early; the results
+        then cover what was extracted so far and 'cancelled' is True.
+        """
         try:
             self.debug_mode = debug_mode
             self.current_filter = search_filter
-            self.initialize_driver()
-            
-            if self.load_cookies():
-                print("Attempting to use saved cookies...")
-                self.driver.get("https://grantstation.com")
-                time.sleep(3)
-                
-                if "user/login" in self.driver.current_url.lower():
-                    print("Saved cookies expired, logging in again...")
-                    self.initialize_driver()
-                else:
-                    print("Successfully logged in with saved cookies")
+            self.force_refresh = force_refresh
+            self.incremental = incremental
+            self.refetch_changed = refetch_changed
+            if self.text_index is None:
+                self.text_index = TextIndex()
+            if self.cache is None:
+                # The text index only keeps what the cache keeps
+                self.cache = OpportunityCache(on_evict=self.text_index.remove_many)
+            if self.seen_index is None:
+                self.seen_index = SeenIndex()
+            # New Search reuses this scraper, so each search starts its own log
+            with self.debug_lock:
+                self.debug_parts = []
+            self.wait_timings.clear()
+            self.last_results = None
+            if max_workers:
+                self.max_workers = max_workers
+            if max_pages:
+                self.max_pages = max_pages
+            if max_results:
+                self.max_results = max_results
+            if engine:
+                if engine not in self.ENGINES:
+                    raise ValueError(f"Unknown engine '{engine}', expected one of {self.ENGINES}")
+                self.engine = engine
+            self.cancel_event.clear()
+            if not offline:
+                self.login()
             
             all_results = []
             filtered_results = []
-            all_results_text = ""
-            filtered_results_text = ""
-
-            # Add imports at top of file
-            import textwrap
             
-            for url in urls:
-                data = self.extract_grant_info(url)
-                all_results.extend(data)
-                
-                # Format all results
-                all_results_text += f"\nSearch Results from {url}:\n\n"
-                for item in data:
-                    all_results_text += self.format_opportunity(item)
-                
-                # Apply filter if one is selected
-                if self.current_filter:
-                    filtered_data = self.apply_filter_to_results(data, self.current_filter)
-                    filtered_results.extend(filtered_data)
-                    
-                    # Format filtered results
-                    if filtered_data:  # Only add header if there are results
-                        filtered_results_text += f"\nFiltered Results matching '{self.current_filter.name}':\n\n"
-                        for item in filtered_data:
-                            filtered_results_text += self.format_opportunity(item)
-                else:
-                    filtered_results = all_results
-                    filtered_results_text = all_results_text
-
-            # Create the results window with both sets of results
-            results_window = ResultsWindow(
-                filtered_results_text,
-                all_results_text,
-                self.debug_text,
-                self.debug_mode,
-                lambda: self.start_new_search(results_window.window),
-                self.save_results
-            )
-            results_window.display()
+            # Compile the filter once for the whole run
+            compiled_filter = compile_filter(self.current_filter)
+            if compiled_filter and self.debug_mode:
+                for error in compiled_filter.errors:
+                    self.add_debug(f"\nDEBUG: Date parsing error: {error}\n")
+            self.listing_filter = compiled_filter if pushdown else None
+            self.skipped_listings = 0
+            self.on_progress = on_progress
+            self.progress = {'links': 0, 'fetched': 0, 'matches': 0}
+            self.progress_started = time.time()
             
+            # An opportunity found by several URLs (a keyword batch, or a search
+            # the planner split up) is fetched and reported once, by URL and
+            # then by opportunity number
+            seen_links = set()
+            by_number = {}
+            self.link_keywords = {}
+            # Streamed results are written out as soon as they are found, so an
+            # opportunity several URLs find must know all their keywords by then:
+            # crawl every listing before loading any detail page
+            listings = [None] * len(urls)
+            if not collect and len(urls) > 1:
+                for index, url in enumerate(urls):
+                    if offline:
+                        listings[index] = list(self.iter_cached_results(url, seen_links))
+                    else:
+                        listings[index] = list(self.iter_opportunity_links(url, seen_links=seen_links))
+            for url, listing in zip(urls, listings):
+                if self.cancel_event.is_set():
+                    break
+                # Filter each opportunity as soon as it is extracted
+                if offline:
+                    items = self.iter_cached_results(url, seen_links) if listing is None else listing
+                else:
+                    items = self.iter_grant_info(url, seen_links, listing)
+                for item in items:
+                    if self.merge_duplicate(item, by_number):
+                        continue
+                    if collect:
+                        all_results.append(item)
+                    matched = True
+                    if compiled_filter:
+                        matched = bool(self.apply_filter_to_results([item], compiled_filter))
+                        if matched and collect:
+                            filtered_results.append(item)
+                    if matched:
+                        self.update_progress(matches=1)
+                        if on_result:
+                            on_result(item)
+
+            if not self.current_filter:
+                filtered_results = all_results
+
+            # Count matches for every saved filter in one pass. Listings skipped
+            # by pushdown are missing from all_results, so the counts would be
+            # too low; leave them out rather than show wrong numbers
+            filter_counts = {}
+            if collect and not self.skipped_listings:
+                self.filter_manager.filters = self.filter_manager.load_filters()
+                filter_matches = self.filter_manager.apply_all_filters(all_results)
+                filter_counts = {name: len(matches) for name, matches in filter_matches.items()}
+
+            # Rank the filtered results by relevance to the search
+            # Keywords the planner took from the filter are not search keywords,
+            # so a re-filter in the results window ranks by its own filter's
+            filter_keywords = self.current_filter.keywords if self.current_filter else []
+            search_keywords = list(dict.fromkeys(
+                keyword for keyword in (search_keyword(url) for url in urls)
+                if keyword and keyword not in filter_keywords
+            ))
+            terms = query_terms(search_keywords, filter_keywords)
+            ranked_results = rank(filtered_results, terms, top_k)
+            facet_counts = FacetIndex(filtered_results).counts()
+
+            if self.debug_mode and self.skipped_listings:
+                self.add_debug(f"\nDEBUG: Skipped {self.skipped_listings} detail pages "
+                               f"ruled out by their listing rows\n")
+            if self.debug_mode and self.wait_timings:
+                self.add_debug(f"\nDEBUG: Page wait timings:\n{self.wait_summary()}\n")
+
+            self.last_results = {
+                'all_results': all_results,
+                'filtered_results': filtered_results,
+                'ranked_results': ranked_results,
+                'filter_counts': filter_counts,
+                'facet_counts': facet_counts,
+                'search_keywords': search_keywords,
+                'skipped_listings': self.skipped_listings,
+                'cancelled': self.cancel_event.is_set(),
+                'debug_text': self.debug_text
+            }
+            return self.last_results
+
         finally:
-            if self.driver:
-                self.driver.quit()
\ No newline at end of file
+            self.release_driver()
+            if self.fetcher:
+                self.fetcher.close()
+                self.fetcher = None
+
+    def run(self, urls, debug_mode=False, search_filter=None, **options):
+        """Run a search and show its results window, returning the search results"""
+        results = self.search(urls, debug_mode=debug_mode, search_filter=search_filter, **options)
+        self.show_results(results)
+        return results
+
+    def show_results(self, results):
+        """Show a search's results window (blocks until it is closed)"""
+        # Imported here so headless use (see cli.py) never loads tkinter
+        from results_window import ResultsWindow
+
+        # Create the results window with both sets of results
+        results_window = ResultsWindow(
+            results['filtered_results'],
+            results['all_results'],
+            results['debug_text'],
+            self.debug_mode,
+            lambda: self.start_new_search(results_window.window),
+            self.save_results,
+            results['filter_counts'],
+            results['ranked_results'],
+            results['facet_counts'],
+            self.format_opportunity,
+            self.current_filter,
+            results.get('skipped_listings', 0),
+            results.get('search_keywords')
+        )
+        results_window.display()
@@ -1,15 +1,25 @@
 # search_interface.py
 
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk
-import urllib.parse
+from tkinter import ttk, filedialog
+from config import DEFAULT_WORKERS, PROGRESS_POLL_MS
+from query_planner import plan_batch_urls, split_keywords, load_keywords
 
 class SearchInterface:
-    def __init__(self, callback):
+    def __init__(self, callback, results_callback=None, cancel_callback=None):
+        # callback runs the search on a background thread and returns its results,
+        # which are handed to results_callback once this window has closed
         self.callback = callback
+        self.results_callback = results_callback
+        self.cancel_callback = cancel_callback
+        self.events = queue.Queue()
+        self.worker = None
+        self.results = None
         self.root = tk.Tk()
         self.root.title("GrantStation Search")
-        self.root.geometry("600x400")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.selected_filter = None
         self.setup_ui()
 
@@ -24,31 +34,39 @@ class SearchInterface:
             text="GrantStation Search Tool", 
             font=('Helvetica', 16, 'bold')
         )
-        title_label.pack(pady=20)
+        title_label.pack(pady=(0, 10))
 
         # Search frame
         search_frame = ttk.Frame(main_frame)
-        search_frame.pack(fill=tk.X, pady=20)
+        search_frame.pack(fill=tk.X, pady=10)
 
         # Search label
         search_label = ttk.Label(
             search_frame, 
-            text="Enter search keyword or phrase:",
+            text="Enter search keyword or phrase (separate several with ;):",
             font=('Helvetica', 10)
         )
         search_label.pack(pady=(0, 5))
 
         # Search entry
         self.search_entry = ttk.Entry(search_frame, width=50)
-        self.search_entry.pack(pady=5)
+        self.search_entry.pack(fill=tk.X, pady=5)
         
-        # Filter button
+        # Keyword batch file and filter buttons, side by side
+        source_frame = ttk.Frame(search_frame)
+        source_frame.pack(pady=5)
+        load_keywords_button = ttk.Button(
+            source_frame,
+            text="Load Keywords File",
+            command=self.load_keywords_file
+        )
+        load_keywords_button.pack(side='left', padx=5)
         filter_button = ttk.Button(
-            search_frame,
+            source_frame,
             text="Select Filter",
             command=self.open_filter_window
         )
-        filter_button.pack(pady=5)
+        filter_button.pack(side='left', padx=5)
         
         # Filter status label
         self.filter_label = ttk.Label(
@@ -58,22 +76,108 @@ class SearchInterface:
         )
         self.filter_label.pack(pady=5)
         
-        # Add debug checkbox
+        # Everyday options, two to a row
+        options_frame = ttk.LabelFrame(search_frame, text="Options", padding=10)
+        options_frame.pack(fill=tk.X, pady=5)
+        options_frame.columnconfigure((0, 1), weight=1)
+        
         self.debug_var = tk.BooleanVar()
-        debug_checkbox = ttk.Checkbutton(
-            search_frame,
+        ttk.Checkbutton(
+            options_frame,
             text="Show Debug Information",
             variable=self.debug_var
+        ).grid(row=0, column=0, sticky='w', pady=2)
+        
+        # Browserless engine checkbox
+        self.http_engine_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            options_frame,
+            text="Fast mode (use Chrome only for login)",
+            variable=self.http_engine_var
+        ).grid(row=0, column=1, sticky='w', pady=2)
+        
+        # Cache bypass checkbox
+        self.force_refresh_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            options_frame,
+            text="Force refresh (ignore cache)",
+            variable=self.force_refresh_var
+        ).grid(row=1, column=0, sticky='w', pady=2)
+        
+        # Parallel workers
+        workers_frame = ttk.Frame(options_frame)
+        workers_frame.grid(row=1, column=1, sticky='w', pady=2)
+        ttk.Label(workers_frame, text="Parallel workers:").pack(side='left')
+        self.workers_var = tk.IntVar(value=DEFAULT_WORKERS)
+        workers_spinbox = ttk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=16,
+            width=5,
+            textvariable=self.workers_var
         )
-        debug_checkbox.pack(pady=5)
+        workers_spinbox.pack(side='left', padx=5)
         
-        # Search button
-        search_button = ttk.Button(
+        # Advanced options, hidden until asked for
+        self.advanced_button = ttk.Button(
             search_frame,
+            text="Advanced \u25b8",
+            command=self.toggle_advanced
+        )
+        self.advanced_button.pack(anchor='w', pady=(5, 0))
+        # Always packed, so the options reappear in the same place when shown
+        advanced_holder = ttk.Frame(search_frame)
+        advanced_holder.pack(fill=tk.X)
+        self.advanced_frame = ttk.Frame(advanced_holder, padding=(10, 5))
+        
+        # Incremental mode checkboxes
+        self.incremental_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            self.advanced_frame,
+            text="Only fetch opportunities new since the last run",
+            variable=self.incremental_var
+        ).grid(row=0, column=0, sticky='w', pady=2)
+        
+        self.refetch_changed_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            self.advanced_frame,
+            text="Also refetch opportunities whose listing changed",
+            variable=self.refetch_changed_var
+        ).grid(row=1, column=0, sticky='w', pady=2)
+        
+        # Listing pushdown checkbox
+        self.pushdown_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.advanced_frame,
+            text="Skip detail pages the filter rules out from the listing\n"
+                 "(faster, but no saved filter counts or re-filtering)",
+            variable=self.pushdown_var
+        ).grid(row=2, column=0, sticky='w', pady=2)
+        
+        # Offline search checkbox
+        self.offline_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            self.advanced_frame,
+            text="Search offline (only opportunities fetched before)",
+            variable=self.offline_var
+        ).grid(row=3, column=0, sticky='w', pady=2)
+        
+        # Search and cancel buttons
+        buttons_frame = ttk.Frame(search_frame)
+        buttons_frame.pack(pady=10)
+        self.search_button = ttk.Button(
+            buttons_frame,
             text="Search",
             command=self.perform_search
         )
-        search_button.pack(pady=10)
+        self.search_button.pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(
+            buttons_frame,
+            text="Cancel",
+            command=self.cancel_search,
+            state='disabled'
+        )
+        self.cancel_button.pack(side='left', padx=5)
 
         # Status label
         self.status_label = ttk.Label(
@@ -82,12 +186,35 @@ class SearchInterface:
             font=('Helvetica', 9, 'italic')
         )
         self.status_label.pack(pady=10)
+
+        # Progress of a running search
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate')
+        self.progress_bar.pack(fill=tk.X, pady=5)
+
+        # Matches as they are extracted
+        ttk.Label(main_frame, text="Matches so far:").pack(anchor='w')
+        live_frame = ttk.Frame(main_frame)
+        live_frame.pack(fill=tk.BOTH, expand=True)
+        self.live_results = tk.Listbox(live_frame, height=8)
+        live_scrollbar = ttk.Scrollbar(live_frame, command=self.live_results.yview)
+        self.live_results.config(yscrollcommand=live_scrollbar.set)
+        live_scrollbar.pack(side='right', fill='y')
+        self.live_results.pack(side='left', fill=tk.BOTH, expand=True)
         
         # Bind Enter key to search function
         self.search_entry.bind('<Return>', lambda e: self.perform_search())
 
+    def toggle_advanced(self):
+        """Show or hide the advanced options; the window resizes to fit"""
+        if self.advanced_frame.winfo_manager():
+            self.advanced_frame.pack_forget()
+            self.advanced_button.config(text="Advanced \u25b8")
+        else:
+            self.advanced_frame.pack(fill=tk.X)
+            self.advanced_button.config(text="Advanced \u25be")
+
     def open_filter_window(self):
-        from filter_manager import FilterWindow
+        from filter_window import FilterWindow
         
         def on_filter_selected(filter_obj):
             self.selected_filter = filter_obj
@@ -98,20 +225,136 @@ class SearchInterface:
             
         filter_window = FilterWindow(self.root, on_filter_selected)
 
+    def load_keywords_file(self):
+        """Fill the search box from a file with one keyword per line"""
+        path = filedialog.askopenfilename(
+            title="Load Keywords",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            keywords = load_keywords(path)
+        except Exception as e:
+            self.status_label.config(text=f"Error loading keywords: {str(e)}")
+            return
+        self.search_entry.delete(0, tk.END)
+        self.search_entry.insert(0, "; ".join(keywords))
+        self.status_label.config(text=f"Loaded {len(keywords)} keywords")
+
+    def get_worker_count(self):
+        try:
+            return max(1, self.workers_var.get())
+        except tk.TclError:
+            return DEFAULT_WORKERS
+
     def perform_search(self):
+        if self.worker and self.worker.is_alive():
+            return
         search_term = self.search_entry.get().strip()
-        if search_term:
-            encoded_term = urllib.parse.quote(search_term)
-            url = f"https://grantstation.com/search/us-federal?keyword={encoded_term}&opp_number=&cfda="
+        # Offline, any filter can be answered from the local index on its own
+        filter_terms = self.selected_filter and (
+            self.offline_var.get() or self.selected_filter.keywords or
+            self.selected_filter.cfda_numbers or self.selected_filter.opportunity_number
+        )
+        if search_term or filter_terms:
+            # One search per keyword, with as much of the filter as the site
+            # supports pushed into the search URLs
+            urls = plan_batch_urls(split_keywords(search_term), self.selected_filter)
             
             self.status_label.config(text="Starting search...")
-            self.root.update()
+            self.search_button.config(state='disabled')
+            self.cancel_button.config(state='normal')
+            self.live_results.delete(0, tk.END)
+            self.progress_bar.config(value=0, maximum=1)
             
-            # Pass URL, debug flag, and selected filter to callback
-            self.callback([url], self.debug_var.get(), self.selected_filter)
-            self.root.destroy()
+            # Pass URLs, debug flag, selected filter and engine to the callback
+            # on a background thread, so this window stays responsive
+            engine = "http" if self.http_engine_var.get() else "selenium"
+            options = dict(
+                engine=engine,
+                max_workers=self.get_worker_count(),
+                force_refresh=self.force_refresh_var.get(),
+                incremental=self.incremental_var.get(),
+                refetch_changed=self.refetch_changed_var.get(),
+                pushdown=self.pushdown_var.get(),
+                offline=self.offline_var.get()
+            )
+            self.worker = threading.Thread(
+                target=self.run_search,
+                args=(urls, self.debug_var.get(), self.selected_filter, options),
+                daemon=True
+            )
+            self.worker.start()
+            self.root.after(PROGRESS_POLL_MS, self.poll_events)
         else:
-            self.status_label.config(text="Please enter a search term")
+            self.status_label.config(text="Please enter a search term or select a filter with keywords")
+
+    def run_search(self, urls, debug_mode, search_filter, options):
+        """Search thread: run the callback, sending results and progress to the UI queue"""
+        try:
+            results = self.callback(
+                urls,
+                debug_mode,
+                search_filter,
+                on_result=lambda opp: self.events.put(('result', opp)),
+                on_progress=lambda progress: self.events.put(('progress', progress)),
+                **options
+            )
+            self.events.put(('done', results))
+        except Exception as e:
+            self.events.put(('error', str(e)))
+
+    def poll_events(self):
+        """Apply queued events from the search thread on the Tk thread"""
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == 'result':
+                    self.live_results.insert(tk.END, payload.get('title', 'N/A'))
+                elif kind == 'progress':
+                    self.show_progress(payload)
+                elif kind == 'done':
+                    self.results = payload
+                    self.root.destroy()
+                    return
+                elif kind == 'error':
+                    self.status_label.config(text=f"Search failed: {payload}")
+                    self.search_button.config(state='normal')
+                    self.cancel_button.config(state='disabled')
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(PROGRESS_POLL_MS, self.poll_events)
+
+    def show_progress(self, progress):
+        to_fetch = max(progress.get('links', 0) - progress.get('skipped', 0), 1)
+        self.progress_bar.config(maximum=to_fetch, value=progress.get('fetched', 0))
+        text = (f"Found {progress.get('links', 0)} listings, fetched {progress.get('fetched', 0)}, "
+                f"{progress.get('matches', 0)} matches")
+        if progress.get('skipped'):
+            text += f", {progress['skipped']} skipped"
+        if progress.get('eta'):
+            minutes, seconds = divmod(int(progress['eta']), 60)
+            text += f" (about {minutes}m {seconds:02d}s left)"
+        if self.cancel_button.instate(['!disabled']):
+            self.status_label.config(text=text)
+
+    def cancel_search(self):
+        if self.worker and self.worker.is_alive() and self.cancel_callback:
+            self.cancel_button.config(state='disabled')
+            self.status_label.config(text="Cancelling, finishing pages already loading...")
+            self.cancel_callback()
+
+    def on_close(self):
+        if self.worker and self.worker.is_alive() and self.cancel_callback:
+            self.cancel_callback()
+        self.root.destroy()
 
     def run(self):
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+        # Let a cancelled search shut its drivers down before moving on
+        if self.worker:
+            self.worker.join()
+        if self.results is not None and self.results_callback:
+            self.results_callback(self.results)
\ No newline at end of file
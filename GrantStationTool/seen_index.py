@@ -0,0 +1,75 @@
+# seen_index.py
+
+import sqlite3
+import threading
+import time
+from config import CACHE_FILE
+
+class SeenIndex:
+    """Remembers every opportunity seen in a listing, with when it was first seen.
+
+    Used to tell new opportunities from ones already reported on an earlier run,
+    and to notice when an opportunity's listing row has changed since then.
+    """
+
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, path=CACHE_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_opportunities ("
+                "url TEXT PRIMARY KEY, opportunity_number TEXT, row_hash TEXT, "
+                "first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_seen_number ON seen_opportunities (opportunity_number)"
+            )
+
+    def status(self, url, row_hash=None):
+        """Classify a listing link as new, changed or unchanged since it was last seen"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT row_hash FROM seen_opportunities WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return self.NEW
+        if row_hash and row[0] and row[0] != row_hash:
+            return self.CHANGED
+        return self.UNCHANGED
+
+    def is_known_number(self, opportunity_number, url):
+        """True if the opportunity number was already seen under a different URL"""
+        if not opportunity_number or opportunity_number == "N/A":
+            return False
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM seen_opportunities WHERE opportunity_number = ? AND url != ?",
+                (opportunity_number, url)
+            ).fetchone()
+        return row is not None
+
+    def record(self, url, opportunity_number=None, row_hash=None):
+        """Mark an opportunity as seen, keeping its original first-seen time"""
+        now = time.time()
+        if opportunity_number == "N/A":
+            opportunity_number = None
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO seen_opportunities "
+                    "(url, opportunity_number, row_hash, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(url) DO UPDATE SET "
+                    "opportunity_number = COALESCE(excluded.opportunity_number, opportunity_number), "
+                    "row_hash = COALESCE(excluded.row_hash, row_hash), "
+                    "last_seen = excluded.last_seen",
+                    (url, opportunity_number, row_hash, now, now)
+                )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,60 @@
+# test_keyword_matcher.py
+#
+# Checks that the Aho-Corasick automaton finds exactly what the substring
+# and regex scans find. Run with: python -m pytest test_keyword_matcher.py
+# (or python test_keyword_matcher.py)
+
+import random
+from itertools import product
+from keyword_matcher import KeywordMatcher
+
+# Small alphabet so keywords overlap, nest and share prefixes and suffixes
+ALPHABET = "abAB"
+SEPARATORS = " -_.,'é1"
+
+def random_word(rng, max_length=4):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, max_length)))
+
+def random_text(rng):
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        parts.append(random_word(rng, 6))
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+def both_matchers(keywords, **options):
+    return (KeywordMatcher(keywords, use_automaton=True, **options),
+            KeywordMatcher(keywords, use_automaton=False, **options))
+
+def test_automaton_matches_substring_scan():
+    rng = random.Random(1234)
+    for whole_word, case_sensitive in product((False, True), repeat=2):
+        for _ in range(200):
+            keywords = [random_word(rng) for _ in range(rng.randint(1, 8))]
+            automaton, scan = both_matchers(keywords, whole_word=whole_word,
+                                            case_sensitive=case_sensitive)
+            for _ in range(20):
+                text = random_text(rng)
+                assert automaton.find(text) == scan.find(text), (
+                    keywords, text, whole_word, case_sensitive)
+
+def test_phrases_and_whole_words():
+    keywords = ["health", "public health", "he", "care", "health care", "c++"]
+    text = "Public Health-care grants for healthcare and C++ tooling; the end"
+    for whole_word in (False, True):
+        automaton, scan = both_matchers(keywords, whole_word=whole_word)
+        assert automaton.find(text) == scan.find(text)
+    automaton, _ = both_matchers(keywords, whole_word=True)
+    assert automaton.find(text) == {"health", "public health", "care", "c++"}
+
+def test_empty_inputs():
+    automaton, scan = both_matchers(["", "  ", "grant"])
+    assert automaton.keywords == scan.keywords == ("grant",)
+    assert automaton.find("") == scan.find("") == set()
+    assert automaton.find("GRANTS") == scan.find("GRANTS") == {"grant"}
+
+if __name__ == "__main__":
+    test_automaton_matches_substring_scan()
+    test_phrases_and_whole_words()
+    test_empty_inputs()
+    print("Automaton and substring matching agree")
@@ -0,0 +1,49 @@
+# test_opportunity.py
+#
+# Checks amount and date parsing for Opportunity records.
+# Run with: python -m pytest test_opportunity.py
+
+from datetime import date
+from opportunity import Opportunity, extract_amount, parse_date
+
+def amount(title="", description=""):
+    return extract_amount({'title': title, 'description': description})
+
+def test_million_applies_only_to_its_own_figure():
+    assert amount("Maine Rural Health Grant", "Awards of up to $50,000") == 50_000
+    assert amount("MAJOR Program", "Up to $250,000 per award. More info at NIH.") == 250_000
+    assert amount("", "A $5 Minimum match is required") == 5
+
+def test_million_amounts():
+    assert amount("", "Total funding of $2 million") == 2_000_000
+    assert amount("", "Total funding of $2.5 Million") == 2_500_000
+    assert amount("", "Ceiling $1.25M per project") == 1_250_000
+    # A million figure is preferred over a plain one mentioned earlier
+    assert amount("", "Up to $50,000 each from a $3 million pool") == 3_000_000
+
+def test_plain_amounts():
+    assert amount("", "Awards of $1,500,000") == 1_500_000
+    assert amount("", "Awards of $50000") == 50_000
+    assert amount("", "Awards of $99.50") == 99.5
+    assert amount("No money mentioned", "None here") is None
+
+def test_explicit_amount_wins():
+    assert extract_amount({'amount': "1200", 'description': "$5 million"}) == 1200.0
+
+def test_opportunity_parses_once():
+    opp = Opportunity.from_dict({
+        'title': "Maine Rural Health Grant",
+        'description': "Awards of up to $50,000",
+        'post_date': "Post Date\n10/31/2024",
+        'close_date': "N/A"
+    }, url="https://grantstation.com/opportunity/1")
+    assert opp.amount == 50_000
+    assert opp.post_date == date(2024, 10, 31)
+    assert opp.close_date is None
+    assert opp['close_date'] == "N/A"
+    assert opp.to_record()['post_date'] == "2024-10-31"
+
+def test_parse_date_formats():
+    assert parse_date("2024-10-31") == date(2024, 10, 31)
+    assert parse_date("31/10/2024") == date(2024, 10, 31)
+    assert parse_date("soon") is None
@@ -0,0 +1,56 @@
+# test_opportunity_cache.py
+#
+# Checks that extracted details are stored on the first lookup and served from
+# the cache on the next. Run with: python -m pytest test_opportunity_cache.py
+
+import time
+from opportunity_cache import OpportunityCache
+from scraper import GrantStationScraper
+
+URL = "https://grantstation.com/opportunity/1"
+DETAILS = {'title': "Rural Health Grant", 'agency': "HRSA", 'opportunity_number': "HRSA-26-001",
+           'post_date': "10/01/2026", 'close_date': "12/01/2026", 'description': "N/A",
+           'eligible_applicants': ["Nonprofits"], 'additional_eligibility': "N/A",
+           'cfda_numbers': ["93.912"], 'additional_info_url': None}
+
+def test_empty_cache_stores_and_returns(tmp_path):
+    cache = OpportunityCache(path=str(tmp_path / "cache.sqlite"))
+    try:
+        # An empty cache must still count as a cache for the scraper's checks
+        assert cache
+        assert cache.get(URL) is None
+        cache.put(URL, DETAILS)
+        assert cache.get(URL) == DETAILS
+    finally:
+        cache.close()
+
+def test_stale_entries_need_ignore_ttl(tmp_path):
+    cache = OpportunityCache(path=str(tmp_path / "cache.sqlite"), ttl_hours=1)
+    try:
+        cache.put(URL, DETAILS)
+        with cache.conn:
+            cache.conn.execute("UPDATE opportunities SET fetched_at = ?", (time.time() - 7200,))
+        assert cache.get(URL) is None
+        assert cache.get(URL, ignore_ttl=True) == DETAILS
+    finally:
+        cache.close()
+
+def test_second_lookup_hits_cache(tmp_path, monkeypatch):
+    # The scraper's FilterManager writes its default filters to the working directory
+    monkeypatch.chdir(tmp_path)
+    scraper = GrantStationScraper("user", "password", engine="http")
+    scraper.cache = OpportunityCache(path=str(tmp_path / "cache.sqlite"))
+    fetched = []
+
+    def extract_detailed_info(url, driver=None):
+        fetched.append(url)
+        return dict(DETAILS)
+
+    scraper.extract_detailed_info = extract_detailed_info
+    try:
+        for _ in range(2):
+            [(link, detailed_info)] = list(scraper.iter_details([{'url': URL}]))
+            assert detailed_info == DETAILS
+        assert fetched == [URL]
+    finally:
+        scraper.close()
@@ -0,0 +1,50 @@
+# test_opportunity_index.py
+#
+# Checks that index queries return exactly what a linear scan with the
+# compiled filter returns. Run with: python -m pytest test_opportunity_index.py
+
+import random
+from filter_engine import compile_filter
+from filter_manager import SearchFilter
+from opportunity_index import OpportunityIndex
+
+AGENCIES = ["NIH", "NSF", "DOE", "EPA"]
+APPLICANTS = ["Nonprofits", "State governments", "Tribal organizations"]
+
+def random_opportunity(rng, i):
+    return {
+        'url': f"https://grantstation.com/opportunity/{i}",
+        'title': f"Grant {i} for {rng.choice(['health', 'water', 'housing'])}",
+        'description': rng.choice(["N/A", "Up to $50,000", "A $2 million pool", "Research support"]),
+        'agency': rng.choice(AGENCIES + ["N/A"]),
+        'post_date': rng.choice(["N/A", f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/2026"]),
+        'close_date': rng.choice(["N/A", f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/2027"]),
+        'eligible_applicants': rng.sample(APPLICANTS, rng.randint(0, 2)),
+        'cfda_numbers': [f"93.{rng.randint(1, 5)}"]
+    }
+
+def random_filter(rng):
+    return SearchFilter(
+        name="random",
+        keywords=rng.choice([[], ["health"], ["water", "grant"]]),
+        min_amount=rng.choice([None, 10_000, 100_000]),
+        max_amount=rng.choice([None, 1_000_000]),
+        start_date=rng.choice([None, "2026-06-01"]),
+        end_date=rng.choice([None, "2027-06-30"]),
+        agencies=rng.sample(AGENCIES, rng.randint(0, 2)),
+        eligible_applicants=rng.sample(APPLICANTS, rng.randint(0, 1))
+    )
+
+def test_query_matches_linear_scan():
+    rng = random.Random(42)
+    opportunities = [random_opportunity(rng, i) for i in range(300)]
+    index = OpportunityIndex(opportunities)
+    for _ in range(100):
+        filter_obj = random_filter(rng)
+        compiled_filter = compile_filter(filter_obj)
+        expected = [opp.url for opp in index.opportunities if compiled_filter(opp)]
+        assert [opp.url for opp in index.query(filter_obj)] == expected
+
+def test_no_filter_returns_everything():
+    opportunities = [random_opportunity(random.Random(i), i) for i in range(10)]
+    assert len(OpportunityIndex(opportunities).query(None)) == 10
@@ -0,0 +1,37 @@
+# test_query_planner.py
+#
+# Checks which search URLs the planner sends for a keyword and filter.
+# Run with: python -m pytest test_query_planner.py
+
+from urllib.parse import parse_qs, urlparse
+from filter_manager import SearchFilter
+from query_planner import plan_batch_urls, plan_search_urls, search_keyword
+
+def params(url):
+    query = parse_qs(urlparse(url).query, keep_blank_values=True)
+    return {name: values[0] for name, values in query.items()}
+
+def test_one_query_for_and_ed_filter_keywords():
+    search_filter = SearchFilter(name="f", keywords=["health", "rural health clinics", "water"])
+    urls = plan_search_urls(None, search_filter)
+    assert [search_keyword(url) for url in urls] == ["rural health clinics"]
+
+def test_typed_keyword_wins():
+    search_filter = SearchFilter(name="f", keywords=["health", "water"])
+    assert [search_keyword(url) for url in plan_search_urls("housing", search_filter)] == ["housing"]
+
+def test_cfda_numbers_are_separate_queries():
+    search_filter = SearchFilter(name="f", keywords=["health"], cfda_numbers=["93.1", "93.2"],
+                                 opportunity_number="HHS-1")
+    urls = plan_search_urls(None, search_filter)
+    assert len(urls) == 2
+    for url in urls:
+        assert search_keyword(url) == "health"
+        assert "HHS-1" in url
+    assert plan_search_urls(None, search_filter, max_queries=1) == plan_search_urls(
+        None, SearchFilter(name="f", keywords=["health"], opportunity_number="HHS-1"))
+
+def test_batch_dedupes_keywords():
+    urls = plan_batch_urls(["water", " water ", "soil", ""])
+    assert [search_keyword(url) for url in urls] == ["water", "soil"]
+    assert len(plan_batch_urls([])) == 1
@@ -0,0 +1,44 @@
+# test_scraper.py
+#
+# Runs searches against stubbed listing and detail pages, without a browser
+# or network. Run with: python -m pytest test_scraper.py
+
+from query_planner import plan_batch_urls
+from scraper import GrantStationScraper
+
+# Which of the stubbed opportunities each search keyword finds
+LISTINGS = {"water": [1, 2], "soil": [2, 3]}
+
+def stub_scraper():
+    scraper = GrantStationScraper("user", "password", engine="http")
+    scraper.login = lambda: None
+    scraper.fetched = []
+
+    def get_listing_page(url):
+        keyword = url.split("keyword=")[-1].split("&")[0]
+        links = [{'url': f"https://grantstation.com/opportunity/{i}", 'title': f"Grant {i}"}
+                 for i in LISTINGS[keyword]]
+        return links, None
+
+    def extract_detailed_info(url, driver=None):
+        scraper.fetched.append(url)
+        return {'title': f"Grant {url[-1]}", 'opportunity_number': f"N-{url[-1]}"}
+
+    scraper.get_listing_page = get_listing_page
+    scraper.extract_detailed_info = extract_detailed_info
+    return scraper
+
+def test_streamed_results_have_every_keyword(tmp_path, monkeypatch):
+    # The cache, seen index and saved filters are written to the working directory
+    monkeypatch.chdir(tmp_path)
+    scraper = stub_scraper()
+    streamed = {}
+    try:
+        # Copy the keywords as an exporter would write them, when each result arrives
+        scraper.search(plan_batch_urls(["water", "soil"]), collect=False,
+                       on_result=lambda opp: streamed.setdefault(opp.url[-1], list(opp.matched_keywords)))
+    finally:
+        scraper.close()
+    assert streamed == {"1": ["water"], "2": ["water", "soil"], "3": ["soil"]}
+    # Each detail page is still loaded once
+    assert len(scraper.fetched) == 3
@@ -0,0 +1,45 @@
+# test_text_index.py
+#
+# Checks offline keyword lookups and that the text index drops what the cache
+# evicts. Run with: python -m pytest test_text_index.py
+
+from opportunity_cache import OpportunityCache
+from text_index import TextIndex
+
+def opportunity(i, description):
+    return {'url': f"https://grantstation.com/opportunity/{i}", 'title': f"Grant {i}",
+            'description': description, 'cfda_numbers': [f"93.{i}"]}
+
+def test_search_documents(tmp_path):
+    index = TextIndex(path=str(tmp_path / "cache.sqlite"))
+    try:
+        index.add_many((opp['url'], opp) for opp in [
+            opportunity(1, "Rural health clinics"),
+            opportunity(2, "Clean water for rural towns"),
+            opportunity(3, "Urban health research")
+        ])
+        assert [opp['title'] for opp in index.search_documents("rural health")] == ["Grant 1"]
+        assert [opp['title'] for opp in index.search_documents("rural health", match_all=False)] == \
+            ["Grant 1", "Grant 2", "Grant 3"]
+        assert [opp['title'] for opp in index.search_documents("93.2")] == ["Grant 2"]
+        assert index.search_documents("") == []
+    finally:
+        index.close()
+
+def test_index_evicts_with_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    index = TextIndex(path=path)
+    cache = OpportunityCache(path=path, max_entries=2, on_evict=index.remove_many)
+    cache.EVICT_EVERY = 1
+    try:
+        for i in range(4):
+            opp = opportunity(i, "health")
+            cache.put(opp['url'], opp)
+            index.add(opp['url'], opp)
+        remaining = [opp['url'] for opp in cache.load_all()]
+        assert len(remaining) == 2
+        assert index.document_count() == 2
+        assert [opp['url'] for opp in index.search_documents("health")] == remaining
+    finally:
+        cache.close()
+        index.close()
@@ -0,0 +1,153 @@
+# text_index.py
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from config import CACHE_FILE
+
+# Words, keeping dotted numbers such as CFDA "93.243" together
+TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+# Opportunity fields that are searchable offline
+INDEXED_FIELDS = ('title', 'description', 'agency', 'eligible_applicants',
+                  'additional_eligibility', 'cfda_numbers')
+
+def tokenize(text):
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def document_terms(opportunity):
+    """Term frequencies for an opportunity's indexed fields"""
+    terms = Counter()
+    for field in INDEXED_FIELDS:
+        value = opportunity.get(field)
+        if not value or value == "N/A":
+            continue
+        if isinstance(value, (list, tuple)):
+            value = " ".join(value)
+        terms.update(tokenize(value))
+    return terms
+
+def documents(rows):
+    """Decode (url, data) rows into opportunity dicts with their URL filled in"""
+    opportunities = []
+    for url, data in rows:
+        opportunity = json.loads(data)
+        opportunity.setdefault('url', url)
+        opportunities.append(opportunity)
+    return opportunities
+
+class TextIndex:
+    """On-disk inverted index over every opportunity fetched so far.
+
+    Each opportunity is stored once with its term postings, so keyword queries
+    can be answered offline from SQLite without touching the site. Adding an
+    opportunity that is already indexed replaces its postings. The scraper
+    removes opportunities when the cache evicts them, so the index stays
+    within the cache's size limit.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS text_documents ("
+                "doc_id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, "
+                "data TEXT NOT NULL, length INTEGER NOT NULL, indexed_at REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS text_postings ("
+                "term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, "
+                "PRIMARY KEY (term, doc_id)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_postings_doc ON text_postings (doc_id)"
+            )
+
+    def add(self, url, opportunity):
+        """Index (or re-index) one opportunity"""
+        self.add_many([(url, opportunity)])
+
+    def add_many(self, items):
+        """Index several (url, opportunity) pairs in one transaction"""
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                for url, opportunity in items:
+                    if hasattr(opportunity, 'to_dict'):
+                        opportunity = opportunity.to_dict()
+                    terms = document_terms(opportunity)
+                    row = self.conn.execute(
+                        "SELECT doc_id FROM text_documents WHERE url = ?", (url,)
+                    ).fetchone()
+                    if row:
+                        doc_id = row[0]
+                        self.conn.execute("DELETE FROM text_postings WHERE doc_id = ?", (doc_id,))
+                        self.conn.execute(
+                            "UPDATE text_documents SET data = ?, length = ?, indexed_at = ? "
+                            "WHERE doc_id = ?",
+                            (json.dumps(opportunity), sum(terms.values()), now, doc_id)
+                        )
+                    else:
+                        doc_id = self.conn.execute(
+                            "INSERT INTO text_documents (url, data, length, indexed_at) "
+                            "VALUES (?, ?, ?, ?)",
+                            (url, json.dumps(opportunity), sum(terms.values()), now)
+                        ).lastrowid
+                    self.conn.executemany(
+                        "INSERT INTO text_postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                        [(term, doc_id, tf) for term, tf in terms.items()]
+                    )
+
+    def remove_many(self, urls):
+        """Drop several opportunities from the index, e.g. when the cache evicts them"""
+        with self.lock:
+            with self.conn:
+                for url in urls:
+                    row = self.conn.execute(
+                        "SELECT doc_id FROM text_documents WHERE url = ?", (url,)
+                    ).fetchone()
+                    if row:
+                        self.conn.execute("DELETE FROM text_postings WHERE doc_id = ?", (row[0],))
+                        self.conn.execute("DELETE FROM text_documents WHERE doc_id = ?", (row[0],))
+
+    def document_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM text_documents").fetchone()[0]
+
+    def search_documents(self, query, match_all=True):
+        """Opportunity dicts containing the query's words, in indexing order. Only
+        the matching documents are read and decoded.
+
+        With match_all every word must occur, otherwise any of them is enough.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        placeholders = ",".join("?" * len(terms))
+        having = f"HAVING COUNT(*) = {len(terms)}" if match_all else ""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT d.url, d.data FROM text_documents d JOIN ("
+                f"SELECT doc_id FROM text_postings WHERE term IN ({placeholders}) "
+                f"GROUP BY doc_id {having}) p ON p.doc_id = d.doc_id ORDER BY d.doc_id",
+                terms
+            ).fetchall()
+        return documents(rows)
+
+    def load_all(self):
+        """Every indexed opportunity dict, with its URL filled in, in indexing order"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url, data FROM text_documents ORDER BY doc_id"
+            ).fetchall()
+        return documents(rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()